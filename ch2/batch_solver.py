@@ -0,0 +1,160 @@
+import typing
+import os
+import time
+import concurrent.futures
+from maze import Maze, MazeLocation, manhattan_distance
+from generic_search import Node, dfs, bfs, astar, node_to_path
+from jps import jps
+
+
+# maze as it is shipped to worker processes: blocked cells are a bitmap,
+# one bit per cell in row major order
+class MazeProblem(typing.NamedTuple):
+    rows: int
+    columns: int
+    blocked: bytes
+    start: typing.Tuple[int, int]
+    goal: typing.Tuple[int, int]
+
+
+class MazeResult(typing.NamedTuple):
+    index: int  # position of the problem in the batch
+    path: typing.Optional[typing.List[typing.Tuple[int, int]]]
+
+
+# per worker process: problems solved and seconds spent solving them
+class BatchReport:
+    def __init__(self) -> None:
+        self.workers: typing.Dict[int, typing.List[float]] = {}
+        self.total_time: float = 0.0
+
+    @property
+    def solved(self) -> int:
+        return int(sum(count for count, _ in self.workers.values()))
+
+    def add(self, pid: int, count: int, busy: float) -> None:
+        totals: typing.List[float] = self.workers.setdefault(pid, [0, 0.0])
+        totals[0] += count
+        totals[1] += busy
+
+    def throughput(self) -> typing.Dict[int, float]:
+        return {pid: count / busy if busy else 0.0 for pid, (count, busy) in self.workers.items()}
+
+    def __str__(self) -> str:
+        lines: typing.List[str] = [
+            f"{self.solved} problems in {self.total_time:.2f}s "
+            f"({self.solved / self.total_time if self.total_time else 0:.0f}/s)"]
+        for pid, rate in sorted(self.throughput().items()):
+            lines.append(f"  worker {pid}: {int(self.workers[pid][0])} problems, {rate:.0f}/s")
+        return "\n".join(lines)
+
+
+def encode_maze(maze: Maze) -> MazeProblem:
+    bits: bytearray = bytearray((maze.rows * maze.columns + 7) // 8)
+    for row in range(maze.rows):
+        for column in range(maze.columns):
+            if maze.blocked(MazeLocation(row, column)):
+                i: int = row * maze.columns + column
+                bits[i >> 3] |= 1 << (i & 7)
+    return MazeProblem(maze.rows, maze.columns, bytes(bits),
+                       tuple(maze.start), tuple(maze.goal))
+
+
+def decode_maze(problem: MazeProblem) -> Maze:
+    blocked: typing.List[MazeLocation] = [
+        MazeLocation(*divmod(i, problem.columns)) for i in range(problem.rows * problem.columns)
+        if problem.blocked[i >> 3] >> (i & 7) & 1]
+    return Maze.from_blocked(problem.rows, problem.columns, blocked,
+                             MazeLocation(*problem.start), MazeLocation(*problem.goal))
+
+
+def solve(maze: Maze, algorithm: str) -> typing.Optional[typing.List[MazeLocation]]:
+    if algorithm == "jps":
+        return jps(maze)
+    node: typing.Optional[Node[MazeLocation]]
+    if algorithm == "dfs":
+        node = dfs(maze.start, maze.goal_test, maze.successors)
+    elif algorithm == "bfs":
+        node = bfs(maze.start, maze.goal_test, maze.successors)
+    elif algorithm == "astar":
+        node = astar(maze.start, maze.goal_test, maze.successors,
+                     manhattan_distance(maze.goal))
+    else:
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+    return None if node is None else node_to_path(node)
+
+
+# runs in a worker process
+def _solve_chunk(chunk: typing.List[typing.Tuple[int, MazeProblem]],
+                 algorithm: str) -> typing.Tuple[int, float, typing.List[MazeResult]]:
+    started: float = time.perf_counter()
+    results: typing.List[MazeResult] = []
+    for index, problem in chunk:
+        path = solve(decode_maze(problem), algorithm)
+        results.append(MazeResult(index, None if path is None else [tuple(ml) for ml in path]))
+    return os.getpid(), time.perf_counter()-started, results
+
+
+# solves problems in a process pool, chunk_size problems per task, and
+# yields results as soon as their chunk is done (not in input order).
+# at most two chunks per worker are in flight, so problems can be a
+# lazy iterable of any length
+def solve_batch(problems: typing.Iterable[MazeProblem], algorithm: str = "astar",
+                workers: typing.Optional[int] = None, chunk_size: int = 64,
+                report: typing.Optional[BatchReport] = None) -> typing.Iterator[MazeResult]:
+    started: float = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    numbered: typing.Iterator[typing.Tuple[int, MazeProblem]] = enumerate(problems)
+    executor: concurrent.futures.ProcessPoolExecutor = concurrent.futures.ProcessPoolExecutor(workers)
+    finished: bool = False
+    try:
+        pending: typing.Set[concurrent.futures.Future] = set()
+        exhausted: bool = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < 2 * workers:
+                chunk: typing.List[typing.Tuple[int, MazeProblem]] = []
+                for item in numbered:
+                    chunk.append(item)
+                    if len(chunk) == chunk_size:
+                        break
+                if len(chunk) < chunk_size:
+                    exhausted = True
+                if chunk:
+                    pending.add(executor.submit(_solve_chunk, chunk, algorithm))
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                pid, busy, results = future.result()
+                if report is not None:
+                    report.add(pid, len(results), busy)
+                yield from results
+        finished = True
+    finally:
+        # a caller that stops early cancels the chunks not started yet and
+        # does not wait for the ones running
+        executor.shutdown(wait=finished, cancel_futures=not finished)
+        if report is not None:
+            report.total_time += time.perf_counter()-started
+
+
+if __name__ == "__main__":
+    import random
+
+    random.seed(1)
+    problems: typing.List[MazeProblem] = [
+        encode_maze(Maze(40, 40, 0.25, goal=MazeLocation(39, 39))) for _ in range(1000)]
+    print(f"{len(problems)} mazes of 40x40, {len(problems[0].blocked)} bytes each encoded")
+
+    started: float = time.perf_counter()
+    expected: typing.List[typing.Optional[typing.List[MazeLocation]]] = [
+        solve(decode_maze(problem), "astar") for problem in problems]
+    serial: float = time.perf_counter()-started
+    print(f"single process: {serial:.2f}s ({len(problems) / serial:.0f}/s)")
+
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        report: BatchReport = BatchReport()
+        for result in solve_batch(problems, "astar", workers, report=report):
+            path = expected[result.index]
+            assert (path is None) == (result.path is None)
+            assert path is None or len(path) == len(result.path)
+        print(f"{workers} worker(s): speedup {serial / report.total_time:.2f}x, {report}")
@@ -1,5 +1,6 @@
 import enum
 import typing
+import array
 
 Nucleotide: enum.IntEnum = enum.IntEnum('Nucleotide', ('A', 'C', 'G', 'T'))
 
@@ -35,10 +36,163 @@ def binary_contains(gene: Gene, key_codon: Codon) -> bool:
     return False
 
 
-acg: Codon = (Nucleotide['A'], Nucleotide['C'], Nucleotide['G'])
-gat: Codon = (Nucleotide['G'], Nucleotide['A'], Nucleotide['T'])
+# codes of the nucleotides in a k-mer code, two bits each, 255 for anything else
+_CODES: bytes = bytes(
+    "ACGT".find(chr(c)) if chr(c) in "ACGT" else 255 for c in range(256))
 
-my_gene: Gene = string_to_gene(gene_str)
-my_sorted_gene = sorted(my_gene)
-print(binary_contains(my_sorted_gene, acg))
-print(binary_contains(my_sorted_gene, gat))
+
+# codes of the k-mers starting at 0, step, 2*step, ... of a string of
+# nucleotide codes. non overlapping k-mers are put together a nucleotide at
+# a time, overlapping ones from the codes of all 1-, 2-, 4-, ... mers
+def _kmer_codes(data: bytes, k: int, step: int) -> typing.List[int]:
+    if step >= k:
+        codes: typing.List[int] = list(data[0::step])
+        for i in range(1, k):
+            codes = [code << 2 | nucleotide for code, nucleotide in zip(codes, data[i::step])]
+        return codes
+    prefix: typing.Optional[typing.List[int]] = None  # codes of the first `length` nucleotides
+    length: int = 0
+    piece: typing.List[int] = list(data)  # codes of all size-mers
+    size: int = 1
+    remaining: int = k
+    while True:
+        if remaining & 1:
+            prefix = piece if prefix is None else [
+                code << 2 * size | rest for code, rest in zip(prefix, piece[length:])]
+            length += size
+        remaining >>= 1
+        if not remaining:
+            break
+        piece = [code << 2 * size | rest for code, rest in zip(piece, piece[size:])]
+        size *= 2
+    assert prefix is not None
+    return prefix[::step]
+
+
+# every k-mer of a gene string with the offsets it occurs at, built in one
+# pass. a k-mer is packed into an int with two bits per nucleotide. for
+# k <= 3 the offsets live in a table with an entry per code (64 for
+# codons). longer k-mers are hashed: a dict holds the first occurrence of
+# each k-mer and an array links every occurrence to the next one.
+# by default k-mers are read like string_to_gene reads codons,
+# step=1 indexes overlapping k-mers
+class CodonIndex:
+    def __init__(self, s: str, k: int = 3, step: typing.Optional[int] = None) -> None:
+        self.k: int = k
+        self.step: int = k if step is None else step
+        data: bytes = s.encode("ascii").translate(_CODES)
+        if 255 in data:
+            raise ValueError(f"not a nucleotide at {data.index(255)}")
+        codes: typing.List[int] = _kmer_codes(data, k, self.step)
+        self._length: int = len(codes)
+        self._table: typing.Optional[typing.List[array.array]] = None
+        self._first: typing.Dict[int, int] = {}
+        self._next: array.array = array.array('l')
+        if k <= 3:
+            self._table = [array.array('l') for _ in range(4 ** k)]
+            for i, code in enumerate(codes):
+                self._table[code].append(i * self.step)
+        else:
+            first: typing.Dict[int, int] = self._first
+            # walk backwards so every chain comes out in increasing order
+            following: typing.List[int] = [-1] * len(codes)
+            for i in range(len(codes)-1, -1, -1):
+                code: int = codes[i]
+                following[i] = first.get(code, -1)
+                first[code] = i
+            self._next = array.array('l', following)
+
+    def __len__(self) -> int:  # k-mers indexed
+        return self._length
+
+    # a k-mer as a string like "ACG" or as a tuple of Nucleotide like a Codon
+    def encode(self, kmer: typing.Union[str, typing.Sequence[Nucleotide]]) -> int:
+        if len(kmer) != self.k:
+            raise ValueError(f"expected {self.k} nucleotides, got {len(kmer)}")
+        code: int = 0
+        for nucleotide in kmer:
+            value: int = _CODES[ord(nucleotide)] if isinstance(nucleotide, str) else nucleotide-1
+            if value == 255:
+                raise ValueError(f"not a nucleotide: {nucleotide!r}")
+            code = code << 2 | value
+        return code
+
+    def __contains__(self, kmer: typing.Union[str, typing.Sequence[Nucleotide]]) -> bool:
+        return self.contains(kmer)
+
+    def contains(self, kmer: typing.Union[str, typing.Sequence[Nucleotide]]) -> bool:
+        code: int = self.encode(kmer)
+        if self._table is not None:
+            return len(self._table[code]) > 0
+        return code in self._first
+
+    def count(self, kmer: typing.Union[str, typing.Sequence[Nucleotide]]) -> int:
+        code: int = self.encode(kmer)
+        if self._table is not None:
+            return len(self._table[code])
+        return len(self._chain(code))
+
+    # offsets into the gene string, in increasing order
+    def positions(self, kmer: typing.Union[str, typing.Sequence[Nucleotide]]) -> typing.List[int]:
+        code: int = self.encode(kmer)
+        if self._table is not None:
+            return self._table[code].tolist()
+        return [i * self.step for i in self._chain(code)]
+
+    def _chain(self, code: int) -> typing.List[int]:
+        indices: typing.List[int] = []
+        i: int = self._first.get(code, -1)
+        while i != -1:
+            indices.append(i)
+            i = self._next[i]
+        return indices
+
+    def batch_contains(self, kmers: typing.Iterable[typing.Union[str, typing.Sequence[Nucleotide]]]
+                       ) -> typing.List[bool]:
+        return [self.contains(kmer) for kmer in kmers]
+
+    def batch_count(self, kmers: typing.Iterable[typing.Union[str, typing.Sequence[Nucleotide]]]
+                    ) -> typing.List[int]:
+        return [self.count(kmer) for kmer in kmers]
+
+    def batch_positions(self, kmers: typing.Iterable[typing.Union[str, typing.Sequence[Nucleotide]]]
+                        ) -> typing.List[typing.List[int]]:
+        return [self.positions(kmer) for kmer in kmers]
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    acg: Codon = (Nucleotide['A'], Nucleotide['C'], Nucleotide['G'])
+    gat: Codon = (Nucleotide['G'], Nucleotide['A'], Nucleotide['T'])
+
+    my_gene: Gene = string_to_gene(gene_str)
+    my_sorted_gene = sorted(my_gene)
+    print(binary_contains(my_sorted_gene, acg))
+    print(binary_contains(my_sorted_gene, gat))
+
+    index: CodonIndex = CodonIndex(gene_str)
+    print(acg in index, gat in index, index.positions(acg))
+
+    random.seed(1)
+    genome: str = "".join(random.choices("ACGT", k=3_000_000))
+    started: float = time.perf_counter()
+    genome_gene: Gene = string_to_gene(genome)
+    sorted_gene: Gene = sorted(genome_gene)
+    print(f"string_to_gene + sorted: {time.perf_counter()-started:.2f}s")
+    started = time.perf_counter()
+    index = CodonIndex(genome)
+    print(f"CodonIndex: {time.perf_counter()-started:.2f}s, {len(index)} codons")
+    queries: typing.List[Codon] = [tuple(random.choice(list(Nucleotide)) for _ in range(3))
+                                   for _ in range(10_000)]
+    started = time.perf_counter()
+    expected: typing.List[bool] = [binary_contains(sorted_gene, codon) for codon in queries]
+    print(f"binary_contains x {len(queries)}: {time.perf_counter()-started:.3f}s")
+    started = time.perf_counter()
+    assert index.batch_contains(queries) == expected
+    print(f"batch_contains x {len(queries)}: {time.perf_counter()-started:.3f}s")
+    started = time.perf_counter()
+    kmers: CodonIndex = CodonIndex(genome, k=12, step=1)
+    print(f"overlapping 12-mers: {time.perf_counter()-started:.2f}s, "
+          f"ACGTACGTACGT at {kmers.positions('ACGTACGTACGT')[:5]}...")
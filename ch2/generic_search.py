@@ -1,6 +1,12 @@
 from __future__ import annotations
 import typing
 import heapq
+import bisect
+import array
+import dataclasses
+import collections
+import math
+import time
 
 T = typing.TypeVar('T')
 
@@ -46,6 +52,39 @@ def binary_contains(sequence: typing.Sequence[C], key: C) -> bool:
     return False
 
 
+# looks up many keys at once. the keys are visited in sorted order and each
+# search starts where the one for the previous key ended: the window
+# doubles until it holds the key, then bisect finds it inside the window.
+# returns for every key, in input order, whether it is in the sorted
+# sequence and the index it would be inserted at (bisect_left)
+def batch_contains(sequence: typing.Sequence[C],
+                   keys: typing.Iterable[C]) -> typing.Tuple[typing.List[bool], typing.List[int]]:
+    key_list: typing.List[C] = list(keys)
+    n: int = len(sequence)
+    order: typing.List[int] = sorted(range(len(key_list)), key=key_list.__getitem__)
+    found: typing.List[bool] = [False] * len(key_list)
+    indices: typing.List[int] = [0] * len(key_list)
+    gap: int = max(1, n // max(1, len(key_list)))  # expected distance between keys
+    low: int = 0
+    for j in order:
+        key: C = key_list[j]
+        high: int = low+gap
+        if high < n and sequence[high] < key:
+            step: int = gap
+            while True:
+                low = high
+                step += step
+                high = low+step
+                if high >= n or not sequence[high] < key:
+                    break
+        high = min(high, n)
+        low = bisect.bisect_left(sequence, key, low, high)
+        indices[j] = low
+        if low < n and not key < sequence[low]:
+            found[j] = True
+    return found, indices
+
+
 class Stack(typing.Generic[T]):
     def __init__(self) -> None:
         self._container: typing.List[T] = []
@@ -54,6 +93,9 @@ class Stack(typing.Generic[T]):
     def empty(self) -> bool:
         return not self._container
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def push(self, item: T) -> None:
         self._container.append(item)
 
@@ -65,15 +107,18 @@ class Stack(typing.Generic[T]):
 
 
 class Node(typing.Generic[T]):
+    __slots__ = ("state", "parent", "cost", "heuristic", "priority")
+
     def __init__(self, state: T, parent: typing.Optional[Node],
                  cost: float = 0.0, heuristic: float = 0.0) -> None:
         self.state: T = state
         self.parent: typing.Optional[Node] = parent
         self.cost: float = cost
         self.heuristic: float = heuristic
+        self.priority: float = cost+heuristic  # update it when cost changes
 
     def __lt__(self, other: Node):
-        return(self.cost+self.heuristic) < (other.cost+other.heuristic)
+        return self.priority < other.priority
 
 
 def node_to_path(node: Node[T]) -> typing.List[T]:
@@ -93,6 +138,9 @@ class Queue(typing.Generic[T]):
     def empty(self) -> bool:
         return not self._container
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def push(self, item: T) -> None:
         self._container.append(item)
 
@@ -111,6 +159,9 @@ class PriorityQueue(typing.Generic[T]):
     def empty(self) -> bool:
         return not self._container
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def push(self, item: T) -> None:
         heapq.heappush(self._container, item)
 
@@ -121,64 +172,567 @@ class PriorityQueue(typing.Generic[T]):
         return repr(self._container)
 
 
+# binary heap that knows where every item is, so the priority of an item
+# already in the queue can be lowered in place (decrease-key)
+class IndexedPriorityQueue(typing.Generic[T]):
+    def __init__(self) -> None:
+        # heap of [priority, tiebreak, item]
+        self._heap: typing.List[typing.List[typing.Any]] = []
+        self._positions: typing.Dict[T, int] = {}
+        self._counter: int = 0
+
+    @property
+    def empty(self) -> bool:
+        return not self._heap
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._positions
+
+    def priority(self, item: T) -> float:
+        return self._heap[self._positions[item]][0]
+
+    def push(self, item: T, priority: float) -> None:
+        if item in self._positions:
+            raise KeyError(f"{item!r} is already in queue")
+        self._counter += 1
+        self._heap.append([priority, self._counter, item])
+        self._positions[item] = len(self._heap)-1
+        self._sift_up(len(self._heap)-1)
+
+    def decrease_key(self, item: T, priority: float) -> None:
+        position: int = self._positions[item]
+        if priority > self._heap[position][0]:
+            raise ValueError("new priority is greater than the current one")
+        self._heap[position][0] = priority
+        self._sift_up(position)
+
+    def pop(self) -> T:
+        heap = self._heap
+        last: typing.List[typing.Any] = heap.pop()
+        if heap:
+            top: typing.List[typing.Any] = heap[0]
+            heap[0] = last
+            self._positions[last[2]] = 0
+            self._sift_down(0)
+        else:
+            top = last
+        del self._positions[top[2]]
+        return top[2]
+
+    def _sift_up(self, position: int) -> None:
+        heap = self._heap
+        entry: typing.List[typing.Any] = heap[position]
+        while position > 0:
+            parent: int = (position-1) // 2
+            above: typing.List[typing.Any] = heap[parent]
+            if above[0] < entry[0] or (above[0] == entry[0] and above[1] < entry[1]):
+                break
+            heap[position] = heap[parent]
+            self._positions[heap[position][2]] = position
+            position = parent
+        heap[position] = entry
+        self._positions[entry[2]] = position
+
+    def _sift_down(self, position: int) -> None:
+        heap = self._heap
+        entry: typing.List[typing.Any] = heap[position]
+        size: int = len(heap)
+        while True:
+            child: int = 2*position+1
+            if child >= size:
+                break
+            if child+1 < size:
+                left: typing.List[typing.Any] = heap[child]
+                right: typing.List[typing.Any] = heap[child+1]
+                if right[0] < left[0] or (right[0] == left[0] and right[1] < left[1]):
+                    child += 1
+            below: typing.List[typing.Any] = heap[child]
+            if entry[0] < below[0] or (entry[0] == below[0] and entry[1] < below[1]):
+                break
+            heap[position] = heap[child]
+            self._positions[heap[position][2]] = position
+            position = child
+        heap[position] = entry
+        self._positions[entry[2]] = position
+
+    def __repr__(self) -> str:
+        return repr(self._heap)
+
+
+# counters and timings collected by a search when a SearchStats is passed
+# to it; times are in seconds, callback times include only the time spent
+# inside goal_test/successors/heuristic
+@dataclasses.dataclass
+class SearchStats:
+    nodes_expanded: int = 0  # nodes popped and goal tested
+    nodes_generated: int = 0  # nodes pushed to the frontier
+    duplicates_rejected: int = 0  # children dropped as already explored
+    stale_skipped: int = 0  # popped nodes dropped as already reached cheaper
+    peak_frontier: int = 0  # for ida_star/iddfs: the longest path held
+    goal_test_time: float = 0.0
+    successors_time: float = 0.0
+    heuristic_time: float = 0.0
+    total_time: float = 0.0
+
+
+def _timed(callback: typing.Callable, stats: SearchStats, field: str) -> typing.Callable:
+    def timed(*args: typing.Any) -> typing.Any:
+        started: float = time.perf_counter()
+        try:
+            return callback(*args)
+        finally:
+            setattr(stats, field, getattr(stats, field) +
+                    time.perf_counter()-started)
+    return timed
+
+
+# the states a search has reached, in the order they were reached, and an
+# open addressing table of their indices into that list: an array of
+# 4-byte slots holding an index or -1, kept at most a third full and
+# probed like the slots of a dict. it replaces the explored set (16 bytes
+# a slot) or a state -> index dict (24 bytes an entry and the index)
+class _StateTable(typing.Generic[T]):
+    def __init__(self, initial: T) -> None:
+        self.states: typing.List[T] = []
+        self._slots: array.array = array.array('i', [-1]) * 8
+        self.index(initial)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    # index of state, appending it to states if it is new
+    def index(self, state: T) -> int:
+        states: typing.List[T] = self.states
+        slots: array.array = self._slots
+        mask: int = len(slots)-1
+        perturb: int = hash(state) & 0xFFFFFFFFFFFFFFFF
+        slot: int = perturb & mask
+        i: int = slots[slot]
+        while i != -1:
+            if states[i] == state:
+                return i
+            perturb >>= 5
+            slot = (5*slot+1+perturb) & mask
+            i = slots[slot]
+        i = len(states)
+        states.append(state)
+        slots[slot] = i
+        if 3*len(states) > len(slots):
+            self._grow()
+        return i
+
+    def _grow(self) -> None:
+        slots: array.array = array.array('i', [-1]) * (2*len(self._slots))
+        mask: int = len(slots)-1
+        for i, state in enumerate(self.states):
+            perturb: int = hash(state) & 0xFFFFFFFFFFFFFFFF
+            slot: int = perturb & mask
+            while slots[slot] != -1:
+                perturb >>= 5
+                slot = (5*slot+1+perturb) & mask
+            slots[slot] = i
+        self._slots = slots
+
+
+# dfs, bfs and astar keep every generated state in a _StateTable and the
+# index of its parent in an array, Node objects are only created for the
+# path that is returned
+def _index_to_node(states: typing.List[T], parents: array.array, index: int,
+                   costs: typing.Optional[array.array] = None,
+                   heuristics: typing.Optional[array.array] = None) -> Node[T]:
+    chain: typing.List[int] = []
+    while index != -1:
+        chain.append(index)
+        index = parents[index]
+    node: typing.Optional[Node[T]] = None
+    for i in reversed(chain):
+        node = Node(states[i], node,
+                    0.0 if costs is None else costs[i],
+                    0.0 if heuristics is None else heuristics[i])
+    assert node is not None
+    return node
+
+
 def dfs(initial: T, goal_test: typing.Callable[[T], bool],
-        successors: typing.Callable[[T], typing.List[T]]) -> typing.Optional[Node[T]]:
-    frontier: Stack[Node[T]] = Stack()
-    frontier.push(Node(initial, None))
-    explored: typing.Set[T] = {initial}
-    while not frontier.empty:
-        current_node: Node[T] = frontier.pop()
-        current_state: T = current_node.state
-        if goal_test(current_state):
-            return current_node
-        for child in successors(current_state):
-            if child in explored:
-                continue
-            explored.add(child)
-            frontier.push(Node(child, current_node))
-    return None
+        successors: typing.Callable[[T], typing.List[T]],
+        stats: typing.Optional[SearchStats] = None) -> typing.Optional[Node[T]]:
+    started: float = time.perf_counter()
+    if stats is not None:
+        goal_test = _timed(goal_test, stats, "goal_test_time")
+        successors = _timed(successors, stats, "successors_time")
+    explored: _StateTable[T] = _StateTable(initial)
+    states: typing.List[T] = explored.states
+    parents: array.array = array.array('i', [-1])
+    frontier: typing.List[int] = [0]  # stack of indices into states
+    try:
+        while frontier:
+            current: int = frontier.pop()
+            current_state: T = states[current]
+            if stats is not None:
+                stats.nodes_expanded += 1
+            if goal_test(current_state):
+                return _index_to_node(states, parents, current)
+            for child in successors(current_state):
+                index: int = len(states)
+                if explored.index(child) != index:
+                    if stats is not None:
+                        stats.duplicates_rejected += 1
+                    continue
+                frontier.append(index)
+                parents.append(current)
+                if stats is not None:
+                    stats.nodes_generated += 1
+            if stats is not None and len(frontier) > stats.peak_frontier:
+                stats.peak_frontier = len(frontier)
+        return None
+    finally:
+        if stats is not None:
+            stats.total_time += time.perf_counter()-started
 
 
 def bfs(initial: T, goal_test: typing.Callable[[T], bool],
-        successors: typing.Callable[[T], typing.List[T]]) -> typing.Optional[Node[T]]:
-    frontier: Queue[Node[T]] = Queue()
-    frontier.push(Node(initial, None))
-    explored: typing.Set[T] = {initial}
-    while not frontier.empty:
-        current_node: Node[T] = frontier.pop()
-        current_state: T = current_node.state
-        if goal_test(current_state):
-            return current_node
-        for child in successors(current_state):
-            if child in explored:
-                continue
-            explored.add(child)
-            frontier.push(Node(child, current_node))
-    return None
+        successors: typing.Callable[[T], typing.List[T]],
+        stats: typing.Optional[SearchStats] = None) -> typing.Optional[Node[T]]:
+    started: float = time.perf_counter()
+    if stats is not None:
+        goal_test = _timed(goal_test, stats, "goal_test_time")
+        successors = _timed(successors, stats, "successors_time")
+    # states are appended in bfs order, so the frontier is states[head:]
+    explored: _StateTable[T] = _StateTable(initial)
+    states: typing.List[T] = explored.states
+    parents: array.array = array.array('i', [-1])
+    head: int = 0
+    try:
+        while head < len(states):
+            current: int = head
+            head += 1
+            current_state: T = states[current]
+            if stats is not None:
+                stats.nodes_expanded += 1
+            if goal_test(current_state):
+                return _index_to_node(states, parents, current)
+            for child in successors(current_state):
+                index: int = len(states)
+                if explored.index(child) != index:
+                    if stats is not None:
+                        stats.duplicates_rejected += 1
+                    continue
+                parents.append(current)
+                if stats is not None:
+                    stats.nodes_generated += 1
+            if stats is not None and len(states)-head > stats.peak_frontier:
+                stats.peak_frontier = len(states)-head
+        return None
+    finally:
+        if stats is not None:
+            stats.total_time += time.perf_counter()-started
 
 
 def astar(initial: T, goal_test: typing.Callable[[T], bool],
           successors: typing.Callable[[T], typing.List[T]],
-          heuristic: typing.Callable[[T], float]) -> typing.Optional[Node[T]]:
-    frontier: PriorityQueue[Node[T]] = PriorityQueue()
-    frontier.push(Node(initial, None, 0.0, heuristic(initial)))
-    explored: typing.Dict[T, float] = {initial: 0.0}
-
-    while not frontier.empty:
-        current_node: Node[T] = frontier.pop()
-        current_state: T = current_node.state
-        if goal_test(current_state):
-            return current_node
-        for child in successors(current_state):
-            new_cost: float = current_node.cost+1
-            if child not in explored or explored[child] > new_cost:
-                explored[child] = new_cost
-                frontier.push(Node(child, current_node,
-                                   new_cost, heuristic(child)))
-    return None
+          heuristic: typing.Callable[[T], float],
+          stats: typing.Optional[SearchStats] = None) -> typing.Optional[Node[T]]:
+    started: float = time.perf_counter()
+    if stats is not None:
+        goal_test = _timed(goal_test, stats, "goal_test_time")
+        successors = _timed(successors, stats, "successors_time")
+        heuristic = _timed(heuristic, stats, "heuristic_time")
+    # one slot per state: a cheaper path overwrites its cost and parent,
+    # the heuristic is computed once per state
+    explored: _StateTable[T] = _StateTable(initial)
+    states: typing.List[T] = explored.states
+    parents: array.array = array.array('i', [-1])
+    costs: array.array = array.array('d', [0.0])
+    heuristics: array.array = array.array('d', [heuristic(initial)])
+    # heap of (cost+heuristic, tiebreak, index). the tiebreak is minus the
+    # index, so of equal estimates the state found last comes first, which
+    # goes deep along ties instead of widening the search. an entry is
+    # stale when its estimate is above the state's current one
+    frontier: typing.List[typing.Tuple[float, int, int]] = [(heuristics[0], 0, 0)]
+    try:
+        while frontier:
+            estimate, _, current = heapq.heappop(frontier)
+            if estimate > costs[current]+heuristics[current]:
+                if stats is not None:
+                    stats.stale_skipped += 1
+                continue  # stale, the state was reached cheaper later
+            if stats is not None:
+                stats.nodes_expanded += 1
+            current_state: T = states[current]
+            if goal_test(current_state):
+                return _index_to_node(states, parents, current, costs, heuristics)
+            new_cost: float = costs[current]+1
+            for child in successors(current_state):
+                count: int = len(states)
+                index: int = explored.index(child)
+                if index == count:
+                    parents.append(current)
+                    costs.append(new_cost)
+                    heuristics.append(heuristic(child))
+                elif costs[index] > new_cost:
+                    parents[index] = current
+                    costs[index] = new_cost
+                else:
+                    if stats is not None:
+                        stats.duplicates_rejected += 1
+                    continue
+                heapq.heappush(frontier, (new_cost+heuristics[index], -index, index))
+                if stats is not None:
+                    stats.nodes_generated += 1
+            if stats is not None and len(frontier) > stats.peak_frontier:
+                stats.peak_frontier = len(frontier)
+        return None
+    finally:
+        if stats is not None:
+            stats.total_time += time.perf_counter()-started
+
+
+# a* where successors return (state, step cost) pairs.
+# with decrease_key=False a state can be in the frontier several times and
+# entries that are worse than the best known cost are skipped when popped;
+# with decrease_key=True every state is in the frontier at most once
+def weighted_astar(initial: T, goal_test: typing.Callable[[T], bool],
+                   successors: typing.Callable[[T], typing.Iterable[typing.Tuple[T, float]]],
+                   heuristic: typing.Callable[[T], float],
+                   decrease_key: bool = False,
+                   stats: typing.Optional[SearchStats] = None) -> typing.Optional[Node[T]]:
+    started: float = time.perf_counter()
+    if stats is not None:
+        goal_test = _timed(goal_test, stats, "goal_test_time")
+        successors = _timed(successors, stats, "successors_time")
+        heuristic = _timed(heuristic, stats, "heuristic_time")
+    best: typing.Dict[T, float] = {initial: 0.0}
+    start: Node[T] = Node(initial, None, 0.0, heuristic(initial))
+    frontier: typing.Any
+    if decrease_key:
+        frontier = IndexedPriorityQueue()
+        nodes: typing.Dict[T, Node[T]] = {initial: start}
+        frontier.push(initial, start.cost+start.heuristic)
+    else:
+        frontier = PriorityQueue()
+        frontier.push(start)
+    try:
+        while not frontier.empty:
+            current_node: Node[T]
+            if decrease_key:
+                current_node = nodes.pop(frontier.pop())
+            else:
+                current_node = frontier.pop()
+                if current_node.cost > best[current_node.state]:
+                    if stats is not None:
+                        stats.stale_skipped += 1
+                    continue  # stale, the state was reached cheaper later
+            current_state: T = current_node.state
+            if stats is not None:
+                stats.nodes_expanded += 1
+            if goal_test(current_state):
+                return current_node
+            for child, step_cost in successors(current_state):
+                new_cost: float = current_node.cost+step_cost
+                if child in best and best[child] <= new_cost:
+                    if stats is not None:
+                        stats.duplicates_rejected += 1
+                    continue
+                best[child] = new_cost
+                if not decrease_key:
+                    frontier.push(Node(child, current_node,
+                                       new_cost, heuristic(child)))
+                elif child in frontier:
+                    node: Node[T] = nodes[child]
+                    node.parent = current_node
+                    node.cost = new_cost
+                    node.priority = new_cost+node.heuristic
+                    frontier.decrease_key(child, node.priority)
+                    continue
+                else:
+                    node = Node(child, current_node, new_cost, heuristic(child))
+                    nodes[child] = node
+                    frontier.push(child, new_cost+node.heuristic)
+                if stats is not None:
+                    stats.nodes_generated += 1
+            if stats is not None and len(frontier) > stats.peak_frontier:
+                stats.peak_frontier = len(frontier)
+        return None
+    finally:
+        if stats is not None:
+            stats.total_time += time.perf_counter()-started
+
+
+# bounded map from state to the smallest depth it was reached at,
+# least recently used states are evicted first
+class TranspositionTable(typing.Generic[T]):
+    def __init__(self, max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError("max_size should be positive")
+        self.max_size: int = max_size
+        self._depths: typing.OrderedDict[T, int] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._depths)
+
+    def clear(self) -> None:
+        self._depths.clear()
+
+    # remember that state was reached at depth, False if it was already
+    # reached at the same or a smaller depth and can be pruned
+    def visit(self, state: T, depth: int) -> bool:
+        known: typing.Optional[int] = self._depths.get(state)
+        if known is not None and known <= depth:
+            self._depths.move_to_end(state)
+            return False
+        self._depths[state] = depth
+        self._depths.move_to_end(state)
+        if len(self._depths) > self.max_size:
+            self._depths.popitem(last=False)
+        return True
+
+
+_EXHAUSTED: typing.Any = object()  # end of a successors iterator
+
+
+def _path_to_node(path: typing.List[T]) -> Node[T]:
+    node: typing.Optional[Node[T]] = None
+    for depth, state in enumerate(path):
+        node = Node(state, node, float(depth))
+    assert node is not None
+    return node
+
+
+# depth first search pruning nodes with depth+heuristic > bound, memory is
+# the current path (plus the optional table). returns the path to a goal or
+# None and the smallest depth+heuristic that was pruned
+def _bounded_dfs(initial: T, goal_test: typing.Callable[[T], bool],
+                 successors: typing.Callable[[T], typing.List[T]],
+                 heuristic: typing.Callable[[T], float], bound: float,
+                 table: typing.Optional[TranspositionTable[T]],
+                 stats: typing.Optional[SearchStats]) -> typing.Tuple[typing.Optional[typing.List[T]], float]:
+    next_bound: float = math.inf
+    f: float = heuristic(initial)
+    if f > bound:
+        return None, f
+    if stats is not None:
+        stats.nodes_expanded += 1
+    if goal_test(initial):
+        return [initial], bound
+    path: typing.List[T] = [initial]
+    on_path: typing.Set[T] = {initial}
+    children: typing.List[typing.Iterator[T]] = [iter(successors(initial))]
+    while children:
+        child: typing.Optional[T] = next(children[-1], _EXHAUSTED)
+        if child is _EXHAUSTED:
+            children.pop()
+            on_path.discard(path.pop())
+            continue
+        depth: int = len(path)
+        if child in on_path or (table is not None and not table.visit(child, depth)):
+            if stats is not None:
+                stats.duplicates_rejected += 1
+            continue
+        f = depth+heuristic(child)
+        if f > bound:
+            if f < next_bound:
+                next_bound = f
+            continue
+        if stats is not None:
+            stats.nodes_expanded += 1
+            stats.nodes_generated += 1
+            if depth+1 > stats.peak_frontier:
+                stats.peak_frontier = depth+1
+        if goal_test(child):
+            path.append(child)
+            return path, bound
+        path.append(child)
+        on_path.add(child)
+        children.append(iter(successors(child)))
+    return None, next_bound
+
+
+# iterative deepening a*: repeated depth first searches with a growing
+# bound on depth+heuristic, memory linear in the solution depth.
+# table_size > 0 adds a transposition table of at most that many states
+# that prunes states already reached at a smaller or equal depth
+def ida_star(initial: T, goal_test: typing.Callable[[T], bool],
+             successors: typing.Callable[[T], typing.List[T]],
+             heuristic: typing.Callable[[T], float],
+             max_cost: float = math.inf, table_size: int = 0,
+             stats: typing.Optional[SearchStats] = None) -> typing.Optional[Node[T]]:
+    started: float = time.perf_counter()
+    if stats is not None:
+        goal_test = _timed(goal_test, stats, "goal_test_time")
+        successors = _timed(successors, stats, "successors_time")
+        heuristic = _timed(heuristic, stats, "heuristic_time")
+    table: typing.Optional[TranspositionTable[T]] = TranspositionTable(
+        table_size) if table_size > 0 else None
+    bound: float = heuristic(initial)
+    try:
+        while bound <= max_cost:
+            if table is not None:
+                table.clear()
+            path, bound = _bounded_dfs(initial, goal_test, successors,
+                                       heuristic, bound, table, stats)
+            if path is not None:
+                return _path_to_node(path)
+            if bound == math.inf:
+                return None  # nothing was pruned, the space is exhausted
+        return None
+    finally:
+        if stats is not None:
+            stats.total_time += time.perf_counter()-started
+
+
+# iterative deepening dfs, ida* without a heuristic
+def iddfs(initial: T, goal_test: typing.Callable[[T], bool],
+          successors: typing.Callable[[T], typing.List[T]],
+          max_depth: float = math.inf, table_size: int = 0,
+          stats: typing.Optional[SearchStats] = None) -> typing.Optional[Node[T]]:
+    return ida_star(initial, goal_test, successors, lambda _: 0,
+                    max_depth, table_size, stats)
 
 
 if __name__ == "__main__":
     print(linear_contains([1, 5, 15, 15, 15, 15, 20], 5))  # True
     print(binary_contains(["a", "d", "е", "f", "z"], "f"))  # True
     print(binary_contains(["john", "mark", "ronald", "sarah"], "sheila"))
+    print(batch_contains(["a", "d", "e", "f", "z"], ["z", "b", "f"]))  # ([True, False, True], [4, 1, 3])
+
+    import random
+    random.seed(1)
+    haystack: typing.List[int] = sorted(random.sample(range(4_000_000), 1_000_000))
+    needles: typing.List[int] = [random.randrange(4_000_000) for _ in range(100_000)]
+    started: float = time.perf_counter()
+    expected: typing.List[bool] = [binary_contains(haystack, needle) for needle in needles]
+    one_by_one: float = time.perf_counter()-started
+    started = time.perf_counter()
+    assert batch_contains(haystack, needles)[0] == expected
+    print(f"{len(needles)} keys in {len(haystack)}: binary_contains {one_by_one:.2f}s, "
+          f"batch_contains {time.perf_counter()-started:.2f}s")
+
+    # weighted grid: entering a cell costs its weight
+    size: int = 300
+    random.seed(1)
+    weights: typing.List[typing.List[int]] = [
+        [random.choice((1, 1, 1, 5, 9)) for _ in range(size)] for _ in range(size)]
+    goal: typing.Tuple[int, int] = (size-1, size-1)
+
+    def grid_successors(cell: typing.Tuple[int, int]) -> typing.List[typing.Tuple[typing.Tuple[int, int], float]]:
+        r, c = cell
+        return [((nr, nc), weights[nr][nc]) for nr, nc in ((r+1, c), (r-1, c), (r, c+1), (r, c-1))
+                if 0 <= nr < size and 0 <= nc < size]
+
+    def grid_heuristic(cell: typing.Tuple[int, int]) -> float:
+        return abs(cell[0]-goal[0])+abs(cell[1]-goal[1])
+
+    for name, decrease_key in (("lazy deletion", False), ("decrease-key", True)):
+        stats: SearchStats = SearchStats()
+        result: typing.Optional[Node[typing.Tuple[int, int]]] = weighted_astar(
+            (0, 0), lambda cell: cell == goal, grid_successors, grid_heuristic,
+            decrease_key, stats)
+        assert result is not None
+        print(f"{name}: cost {result.cost}, {stats.nodes_expanded} expanded, "
+              f"{stats.nodes_generated} pushed, {stats.stale_skipped} stale, "
+              f"peak frontier {stats.peak_frontier}, {stats.total_time:.2f}s "
+              f"({stats.successors_time:.2f}s in successors, "
+              f"{stats.heuristic_time:.2f}s in heuristic)")
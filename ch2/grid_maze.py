@@ -0,0 +1,149 @@
+# needs numpy, the only module of the repo that does
+import typing
+import numpy as np
+from maze import Cell, MazeLocation
+
+# cell codes of the uint8 grid, in the order of Cell
+EMPTY, BLOCKED, START, GOAL, PATH = range(5)
+_SYMBOLS: np.ndarray = np.frombuffer(
+    "".join(c.value for c in Cell).encode("ascii"), dtype=np.uint8)
+
+
+# maze over a uint8 numpy grid, a drop in for Maze with
+# a vectorized solver for big occupancy grids
+class GridMaze:
+    def __init__(self, rows: int = 10, columns: int = 10, sparseness: float = 0.2,
+                 start: MazeLocation = MazeLocation(0, 0),
+                 goal: MazeLocation = MazeLocation(9, 9),
+                 seed: typing.Optional[int] = None) -> None:
+        self._rows: int = rows
+        self._columns: int = columns
+        self.start: MazeLocation = start
+        self.goal: MazeLocation = goal
+        random: np.random.Generator = np.random.default_rng(seed)
+        self._grid: np.ndarray = np.where(random.random((rows, columns)) < sparseness,
+                                          BLOCKED, EMPTY).astype(np.uint8)
+        self._grid[start] = START
+        self._grid[goal] = GOAL
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    def blocked(self, ml: MazeLocation) -> bool:
+        return bool(self._grid[ml] == BLOCKED)
+
+    def __str__(self) -> str:
+        lines: np.ndarray = np.empty((self._rows, self._columns+1), dtype=np.uint8)
+        lines[:, :-1] = _SYMBOLS[self._grid]
+        lines[:, -1] = ord("\n")
+        return lines.tobytes().decode("ascii")
+
+    def goal_test(self, ml: MazeLocation) -> bool:
+        return ml == self.goal
+
+    def successors(self, ml: MazeLocation) -> typing.List[MazeLocation]:
+        locations: typing.List[MazeLocation] = []
+        grid: np.ndarray = self._grid
+        if ml.row+1 < self._rows and grid[ml.row+1, ml.column] != BLOCKED:
+            locations.append(MazeLocation(ml.row+1, ml.column))
+        if ml.row-1 >= 0 and grid[ml.row-1, ml.column] != BLOCKED:
+            locations.append(MazeLocation(ml.row-1, ml.column))
+        if ml.column+1 < self._columns and grid[ml.row, ml.column+1] != BLOCKED:
+            locations.append(MazeLocation(ml.row, ml.column+1))
+        if ml.column-1 >= 0 and grid[ml.row, ml.column-1] != BLOCKED:
+            locations.append(MazeLocation(ml.row, ml.column-1))
+        return locations
+
+    def _set(self, path: typing.List[MazeLocation], code: int) -> None:
+        if path:
+            rows, columns = zip(*path)
+            self._grid[list(rows), list(columns)] = code
+        self._grid[self.start] = START
+        self._grid[self.goal] = GOAL
+
+    def mark(self, path: typing.List[MazeLocation]):
+        self._set(path, PATH)
+
+    def clear(self, path: typing.List[MazeLocation]):
+        self._set(path, EMPTY)
+
+    # steps from every cell to the goal, -1 for blocked and unreachable cells.
+    # bfs from the goal, one numpy pass over the whole wavefront per step
+    def distance_field(self) -> np.ndarray:
+        columns: int = self._columns
+        size: int = self._rows * columns
+        free: np.ndarray = (self._grid != BLOCKED).ravel()
+        distances: np.ndarray = np.full(size, -1, dtype=np.int32)
+        frontier: np.ndarray = np.array(
+            [self.goal.row * columns + self.goal.column], dtype=np.int64)
+        distances[frontier] = 0
+        step: int = 0
+        while frontier.size:
+            step += 1
+            column: np.ndarray = frontier % columns
+            candidates: np.ndarray = np.concatenate((
+                frontier[frontier >= columns] - columns,
+                frontier[frontier < size - columns] + columns,
+                frontier[column > 0] - 1,
+                frontier[column < columns - 1] + 1))
+            candidates = candidates[free[candidates] & (distances[candidates] < 0)]
+            distances[candidates] = step
+            frontier = np.unique(candidates)
+        return distances.reshape(self._rows, columns)
+
+    # shortest path from start to goal read from a distance field, in the
+    # format of node_to_path; None if the goal can not be reached
+    def path_from(self, start: MazeLocation,
+                  field: typing.Optional[np.ndarray] = None) -> typing.Optional[typing.List[MazeLocation]]:
+        if field is None:
+            field = self.distance_field()
+        distance: int = int(field[start])
+        if distance < 0:
+            return None
+        path: typing.List[MazeLocation] = [start]
+        row, column = start
+        while distance > 0:
+            distance -= 1
+            for r, c in ((row+1, column), (row-1, column), (row, column+1), (row, column-1)):
+                if 0 <= r < self._rows and 0 <= c < self._columns and field[r, c] == distance:
+                    row, column = r, c
+                    break
+            path.append(MazeLocation(row, column))
+        return path
+
+
+if __name__ == "__main__":
+    import time
+    from generic_search import bfs, node_to_path
+
+    maze: GridMaze = GridMaze()
+    print(maze)
+    path: typing.Optional[typing.List[MazeLocation]] = maze.path_from(maze.start)
+    if path is None:
+        print("No solution found")
+    else:
+        maze.mark(path)
+        print(maze)
+        maze.clear(path)
+
+    big: GridMaze = GridMaze(1000, 1000, 0.2, goal=MazeLocation(999, 999), seed=1)
+    start: float = time.perf_counter()
+    node = bfs(big.start, big.goal_test, big.successors)
+    bfs_time: float = time.perf_counter()-start
+    start = time.perf_counter()
+    path = big.path_from(big.start)
+    field_time: float = time.perf_counter()-start
+    assert (node is None) == (path is None)
+    assert node is None or len(node_to_path(node)) == len(path)
+    print(f"1000x1000: bfs {bfs_time:.2f}s, distance field + path {field_time:.2f}s")
+
+    huge: GridMaze = GridMaze(4000, 4000, 0.2, goal=MazeLocation(3999, 3999), seed=1)
+    start = time.perf_counter()
+    field: np.ndarray = huge.distance_field()
+    print(f"4000x4000: distance field in {time.perf_counter()-start:.2f}s, "
+          f"{int((field >= 0).sum())} reachable cells")
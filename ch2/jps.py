@@ -0,0 +1,176 @@
+import typing
+import heapq
+import time
+from maze import Maze, MazeLocation
+from generic_search import SearchStats
+
+# jump point search for 4-connected grids with unit moves.
+# among equally short paths only those that go horizontally as long as
+# possible are followed: a horizontal jump runs until it is blocked, reaches
+# the goal or a vertical jump from one of its cells finds a jump point; a
+# vertical jump runs until it is blocked, reaches the goal or a horizontal
+# neighbor opens up that was blocked one row earlier (a forced neighbor).
+# only cells where the direction may change get onto the open list.
+
+Direction = typing.Tuple[int, int]  # (row step, column step)
+
+
+class _Grid:
+    def __init__(self, maze: typing.Any) -> None:
+        self.rows: int = maze.rows
+        self.columns: int = maze.columns
+        self.goal: typing.Tuple[int, int] = tuple(maze.goal)
+        self.free: bytearray = bytearray(
+            not maze.blocked(MazeLocation(r, c))
+            for r in range(self.rows) for c in range(self.columns))
+
+    def is_free(self, row: int, column: int) -> bool:
+        return 0 <= row < self.rows and 0 <= column < self.columns \
+            and self.free[row * self.columns + column] == 1
+
+    def forced(self, row: int, column: int, dr: int, dc: int) -> bool:
+        # horizontal neighbor on side dc is open here but was blocked on the row we came from
+        return self.is_free(row, column+dc) and not self.is_free(row-dr, column+dc)
+
+    def jump_vertical(self, row: int, column: int, dr: int) -> typing.Optional[typing.Tuple[int, int]]:
+        while True:
+            row += dr
+            if not self.is_free(row, column):
+                return None
+            if (row, column) == self.goal or self.forced(row, column, dr, 1) \
+                    or self.forced(row, column, dr, -1):
+                return row, column
+
+    def jump_horizontal(self, row: int, column: int, dc: int) -> typing.Optional[typing.Tuple[int, int]]:
+        while True:
+            column += dc
+            if not self.is_free(row, column):
+                return None
+            if (row, column) == self.goal or self.jump_vertical(row, column, 1) is not None \
+                    or self.jump_vertical(row, column, -1) is not None:
+                return row, column
+
+    def directions(self, row: int, column: int, arrived: typing.Optional[Direction]) -> typing.List[Direction]:
+        if arrived is None:  # start
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dr, dc = arrived
+        if dc != 0:
+            return [(0, dc), (1, 0), (-1, 0)]
+        return [(dr, 0)] + [(0, side) for side in (1, -1)
+                            if self.forced(row, column, dr, side)]
+
+    def jump(self, row: int, column: int, direction: Direction) -> typing.Optional[typing.Tuple[int, int]]:
+        if direction[0] == 0:
+            return self.jump_horizontal(row, column, direction[1])
+        return self.jump_vertical(row, column, direction[0])
+
+
+def _straight_line(start: typing.Tuple[int, int], end: typing.Tuple[int, int]) -> typing.List[MazeLocation]:
+    dr: int = (end[0] > start[0]) - (end[0] < start[0])
+    dc: int = (end[1] > start[1]) - (end[1] < start[1])
+    steps: int = abs(end[0]-start[0]) + abs(end[1]-start[1])
+    return [MazeLocation(start[0]+dr*i, start[1]+dc*i) for i in range(1, steps+1)]
+
+
+# shortest path from maze.start to maze.goal as a list of locations, the
+# same list node_to_path returns for the generic searches; None if there
+# is no path. works on Maze and on anything with rows, columns, blocked(),
+# start and goal
+def jps(maze: typing.Any, stats: typing.Optional[SearchStats] = None) -> typing.Optional[typing.List[MazeLocation]]:
+    started: float = time.perf_counter()
+    grid: _Grid = _Grid(maze)
+    goal: typing.Tuple[int, int] = grid.goal
+
+    def heuristic(cell: typing.Tuple[int, int]) -> int:
+        return abs(cell[0]-goal[0]) + abs(cell[1]-goal[1])
+
+    start: typing.Tuple[int, int] = tuple(maze.start)
+    # a jump point is (cell, direction it was reached in), the direction
+    # decides which jumps are tried from it
+    Key = typing.Tuple[typing.Tuple[int, int], typing.Optional[Direction]]
+    start_key: Key = (start, None)
+    best: typing.Dict[Key, int] = {start_key: 0}
+    parent: typing.Dict[Key, typing.Optional[Key]] = {start_key: None}
+    counter: int = 0
+    frontier: typing.List[typing.Tuple[int, int, int, Key]] = [
+        (heuristic(start), 0, counter, start_key)]  # (f, -g, tiebreak, key)
+    try:
+        while frontier:
+            _, cost, _, key = heapq.heappop(frontier)
+            cost = -cost
+            if cost > best[key]:
+                if stats is not None:
+                    stats.stale_skipped += 1
+                continue
+            if stats is not None:
+                stats.nodes_expanded += 1
+            cell, arrived = key
+            if cell == goal:
+                cells: typing.List[typing.Tuple[int, int]] = []
+                current: typing.Optional[Key] = key
+                while current is not None:
+                    cells.append(current[0])
+                    current = parent[current]
+                cells.reverse()
+                path: typing.List[MazeLocation] = [MazeLocation(*start)]
+                for a, b in zip(cells, cells[1:]):
+                    path.extend(_straight_line(a, b))
+                return path
+            for direction in grid.directions(cell[0], cell[1], arrived):
+                found: typing.Optional[typing.Tuple[int, int]] = grid.jump(
+                    cell[0], cell[1], direction)
+                if found is None:
+                    continue
+                new_key: Key = (found, direction)
+                new_cost: int = cost + abs(found[0]-cell[0]) + abs(found[1]-cell[1])
+                if new_key in best and best[new_key] <= new_cost:
+                    if stats is not None:
+                        stats.duplicates_rejected += 1
+                    continue
+                best[new_key] = new_cost
+                parent[new_key] = key
+                counter += 1
+                heapq.heappush(frontier, (new_cost+heuristic(found),
+                                          -new_cost, counter, new_key))
+                if stats is not None:
+                    stats.nodes_generated += 1
+            if stats is not None and len(frontier) > stats.peak_frontier:
+                stats.peak_frontier = len(frontier)
+        return None
+    finally:
+        if stats is not None:
+            stats.total_time += time.perf_counter()-started
+
+
+if __name__ == "__main__":
+    import random
+    from generic_search import astar, node_to_path
+    from maze import manhattan_distance
+
+    maze: Maze = Maze()
+    path: typing.Optional[typing.List[MazeLocation]] = jps(maze)
+    if path is None:
+        print("No solution found")
+    else:
+        maze.mark(path)
+        print(maze)
+        maze.clear(path)
+
+    size: int = 300
+    random.seed(1)
+    for sparseness in (0.0, 0.05, 0.1, 0.2, 0.3):
+        astar_stats: SearchStats = SearchStats()
+        jps_stats: SearchStats = SearchStats()
+        solved: int = 0
+        for _ in range(5):
+            maze = Maze(size, size, sparseness, goal=MazeLocation(size-1, size-1))
+            node = astar(maze.start, maze.goal_test, maze.successors,
+                         manhattan_distance(maze.goal), stats=astar_stats)
+            path = jps(maze, stats=jps_stats)
+            assert (node is None) == (path is None)
+            if node is not None and path is not None:
+                assert len(node_to_path(node)) == len(path)
+                solved += 1
+        print(f"sparseness {sparseness:.2f} ({solved}/5 solvable): "
+              f"astar {astar_stats.nodes_expanded // 5} expanded {astar_stats.total_time / 5:.3f}s, "
+              f"jps {jps_stats.nodes_expanded // 5} expanded {jps_stats.total_time / 5:.3f}s")
@@ -2,7 +2,7 @@ import enum
 import typing
 import random
 import math
-from generic_search import Node, dfs, bfs, node_to_path, astar
+from generic_search import Node, dfs, bfs, node_to_path, astar, ida_star, SearchStats
 
 
 class Cell(str, enum.Enum):
@@ -32,12 +32,41 @@ class Maze:
         self._grid[start.row][start.column] = Cell.START
         self._grid[goal.row][goal.column] = Cell.GOAL
 
+    # maze with exactly the given cells blocked, no random fill
+    @classmethod
+    def from_blocked(cls, rows: int, columns: int, blocked: typing.Iterable[MazeLocation],
+                     start: MazeLocation, goal: MazeLocation) -> "Maze":
+        # built without __init__, whose random fill draws a number per cell
+        # even when nothing gets blocked
+        maze: Maze = cls.__new__(cls)
+        maze._rows = rows
+        maze._columns = columns
+        maze.start = start
+        maze.goal = goal
+        maze._grid = [[Cell.EMPTY for c in range(columns)] for r in range(rows)]
+        for ml in blocked:
+            maze._grid[ml.row][ml.column] = Cell.BLOCKED
+        maze._grid[start.row][start.column] = Cell.START
+        maze._grid[goal.row][goal.column] = Cell.GOAL
+        return maze
+
     def _randomly_fill(self, rows: int, columns: int, sparseness: float) -> None:
         for row in range(rows):
             for column in range(columns):
                 if random.uniform(0, 1.0) < sparseness:
                     self._grid[row][column] = Cell.BLOCKED
 
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    def blocked(self, ml: MazeLocation) -> bool:
+        return self._grid[ml.row][ml.column] == Cell.BLOCKED
+
     def __str__(self):
         output: str = ""
         for row in self._grid:
@@ -133,3 +162,18 @@ if __name__ == "__main__":
         maze.mark(path4)
         print(maze)
         maze.clear(path4)
+
+    print('\n\n')
+    stats: SearchStats = SearchStats()
+    solution5: typing.Optional[Node[MazeLocation]] = ida_star(
+        maze.start, maze.goal_test, maze.successors, manhattan_distance(maze.goal),
+        table_size=1000, stats=stats)
+    if solution5 is None:
+        print("No solution found")
+    else:
+        path5: typing.List[MazeLocation] = node_to_path(solution5)
+        maze.mark(path5)
+        print(maze)
+        maze.clear(path5)
+        print(f"IDA* expanded {stats.nodes_expanded} nodes, "
+              f"deepest path held {stats.peak_frontier} states")
@@ -1,19 +1,45 @@
 
 from __future__ import annotations
 import typing
-from generic_search import bfs, Node, node_to_path
+import time
+from generic_search import bfs, Node, node_to_path, SearchStats
 
 MAX_NUM: int = 3
 
 
+# a state as one int: west bank missionaries and cannibals, then the boat
+def pack_state(missionaries: int, cannibals: int, boat: bool, max_num: int = MAX_NUM) -> int:
+    return (missionaries * (max_num+1) + cannibals) * 2 + boat
+
+
+def unpack_state(key: int, max_num: int = MAX_NUM) -> typing.Tuple[int, int, bool]:
+    missionaries, cannibals = divmod(key // 2, max_num+1)
+    return missionaries, cannibals, bool(key & 1)
+
+
 class MCState:
-    def __init__(self, missionaries: int, cannibals: int, boat: bool) -> None:
+    def __init__(self, missionaries: int, cannibals: int, boat: bool,
+                 max_num: int = MAX_NUM) -> None:
+        self.max_num: int = max_num  # missionaries and cannibals of each kind
         self.wm: int = missionaries  # west bank missionaries
         self.wc: int = cannibals  # west bank cannibals
-        self.em: int = MAX_NUM-self.wm  # east bank missionaries
-        self.ec: int = MAX_NUM-self.wc  # east coat cannibals
+        self.em: int = max_num-self.wm  # east bank missionaries
+        self.ec: int = max_num-self.wc  # east coat cannibals
         self.boat: bool = boat
 
+    # the whole state packed into one int, equal states have equal keys
+    @property
+    def key(self) -> int:
+        return pack_state(self.wm, self.wc, self.boat, self.max_num)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MCState):
+            return NotImplemented
+        return self.key == other.key and self.max_num == other.max_num
+
+    def __hash__(self) -> int:
+        return self.key
+
     def __str__(self) -> str:
         return f"""On the west bank there are {self.wm} missionaries and {self.wc} cannibals.
 On the east bank there are {self.em} missionaries and {self.ec} cannibals.
@@ -28,35 +54,91 @@ The boat is оп the {'west' if self.boat else 'east'} bank. \n"""
         return True
 
     def goal_test(self) -> bool:
-        return self.is_legal and self.em == MAX_NUM and self.ec == MAX_NUM
+        return self.is_legal and self.em == self.max_num and self.ec == self.max_num
 
     def successors(self) -> typing.List[MCState]:
         sucs: typing.List[MCState] = []
         if self.boat:  # boat is on west bank
             if self.wm > 1:
-                sucs.append(MCState(self.wm-2, self.wc, not self.boat))
+                sucs.append(MCState(self.wm-2, self.wc, not self.boat, self.max_num))
             if self.wm > 0:
-                sucs.append(MCState(self.wm-1, self.wc, not self.boat))
+                sucs.append(MCState(self.wm-1, self.wc, not self.boat, self.max_num))
             if self.wc > 1:
-                sucs.append(MCState(self.wm, self.wc-2, not self.boat))
+                sucs.append(MCState(self.wm, self.wc-2, not self.boat, self.max_num))
             if self.wc > 0:
-                sucs.append(MCState(self.wm, self.wc-1, not self.boat))
+                sucs.append(MCState(self.wm, self.wc-1, not self.boat, self.max_num))
             if self.wc > 0 and self.wm > 0:
-                sucs.append(MCState(self.wm-1, self.wc-1, not self.boat))
+                sucs.append(MCState(self.wm-1, self.wc-1, not self.boat, self.max_num))
         else:  # boat is on east bank
             if self.em > 1:
-                sucs.append(MCState(self.wm+2, self.wc, not self.boat))
+                sucs.append(MCState(self.wm+2, self.wc, not self.boat, self.max_num))
             if self.em > 0:
-                sucs.append(MCState(self.wm+1, self.wc, not self.boat))
+                sucs.append(MCState(self.wm+1, self.wc, not self.boat, self.max_num))
             if self.ec > 1:
-                sucs.append(MCState(self.wm, self.wc+2, not self.boat))
+                sucs.append(MCState(self.wm, self.wc+2, not self.boat, self.max_num))
             if self.ec > 0:
-                sucs.append(MCState(self.wm, self.wc+1, not self.boat))
+                sucs.append(MCState(self.wm, self.wc+1, not self.boat, self.max_num))
             if self.ec > 0 and self.em > 0:
-                sucs.append(MCState(self.wm+1, self.wc+1, not self.boat))
+                sucs.append(MCState(self.wm+1, self.wc+1, not self.boat, self.max_num))
         return [x for x in sucs if x.is_legal]
 
 
+# missionaries and cannibals with max_num of each and a boat for up to
+# boat_capacity people. states are packed ints and the moves from every
+# legal state are computed once, so a search step is one dict lookup.
+# with a boat for two there is no solution for more than 3 of each,
+# for three no solution for more than 5, with four or more seats every
+# instance can be solved
+class MCProblem:
+    def __init__(self, max_num: int = MAX_NUM, boat_capacity: int = 2) -> None:
+        self.max_num: int = max_num
+        self.boat_capacity: int = boat_capacity
+        self.start: int = pack_state(max_num, max_num, True, max_num)
+        self.goal: int = pack_state(0, 0, False, max_num)
+        loads: typing.List[typing.Tuple[int, int]] = [
+            (m, c) for m in range(boat_capacity+1)
+            for c in range(boat_capacity+1-m) if m+c > 0]
+        self._moves: typing.Dict[int, typing.Tuple[int, ...]] = {}
+        for wm in range(max_num+1):
+            for wc in range(max_num+1):
+                if not self.is_legal(wm, wc):
+                    continue
+                for boat in (True, False):
+                    sign: int = -1 if boat else 1  # the boat carries people away from its bank
+                    self._moves[pack_state(wm, wc, boat, max_num)] = tuple(
+                        pack_state(wm+sign*m, wc+sign*c, not boat, max_num) for m, c in loads
+                        if 0 <= wm+sign*m <= max_num and 0 <= wc+sign*c <= max_num
+                        and self.is_legal(wm+sign*m, wc+sign*c))
+
+    def is_legal(self, wm: int, wc: int) -> bool:
+        em: int = self.max_num-wm
+        ec: int = self.max_num-wc
+        return not (0 < wm < wc or 0 < em < ec)
+
+    @property
+    def state_count(self) -> int:  # legal states
+        return len(self._moves)
+
+    def goal_test(self, key: int) -> bool:
+        return key == self.goal
+
+    def successors(self, key: int) -> typing.Tuple[int, ...]:
+        return self._moves[key]
+
+    def state(self, key: int) -> MCState:
+        wm, wc, boat = unpack_state(key, self.max_num)
+        return MCState(wm, wc, boat, self.max_num)
+
+    # shortest crossing, None if there is none. pass stats to get the
+    # number of states visited
+    def solve(self, stats: typing.Optional[SearchStats] = None) -> typing.Optional[typing.List[MCState]]:
+        solution: typing.Optional[Node[int]] = bfs(
+            self.start, self.goal_test, self.successors, stats)
+        if solution is None:
+            return None
+        return [self.state(key) for key in node_to_path(solution)]
+
+
 def display_solution(path: typing.List[MCState]) -> None:
     if len(path) == 0:
         return
@@ -80,3 +162,13 @@ if __name__ == "__main__":
     else:
         path: typing.List[MCState] = node_to_path(solution)
         display_solution(path)
+
+    for max_num, boat_capacity in ((3, 2), (4, 2), (5, 3), (100, 4), (500, 4), (500, 10)):
+        started: float = time.perf_counter()
+        problem: MCProblem = MCProblem(max_num, boat_capacity)
+        stats: SearchStats = SearchStats()
+        crossing: typing.Optional[typing.List[MCState]] = problem.solve(stats)
+        print(f"{max_num} of each, boat for {boat_capacity}: "
+              f"{'no solution' if crossing is None else f'{len(crossing)-1} crossings'}, "
+              f"{stats.nodes_expanded} of {problem.state_count} states visited "
+              f"in {time.perf_counter()-started:.3f}s")
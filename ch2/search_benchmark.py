@@ -0,0 +1,116 @@
+from __future__ import annotations
+import typing
+import collections
+import heapq
+import random
+import time
+import tracemalloc
+from maze import Maze, MazeLocation, manhattan_distance, euclidian_distance
+from generic_search import dfs, bfs, astar, node_to_path
+
+T = typing.TypeVar('T')
+
+# peak memory and time of the generic searches on one large maze, next to
+# the searches as they were before the index arrays: a node object per
+# state reached, frontiers holding nodes
+
+
+class _OldNode:
+    def __init__(self, state: typing.Any, parent: typing.Optional[_OldNode],
+                 cost: float = 0.0, heuristic: float = 0.0) -> None:
+        self.state: typing.Any = state
+        self.parent: typing.Optional[_OldNode] = parent
+        self.cost: float = cost
+        self.heuristic: float = heuristic
+
+    def __lt__(self, other: _OldNode) -> bool:
+        return (self.cost+self.heuristic) < (other.cost+other.heuristic)
+
+
+def _old_path(node: typing.Optional[_OldNode]) -> typing.List[typing.Any]:
+    path: typing.List[typing.Any] = []
+    while node is not None:
+        path.append(node.state)
+        node = node.parent
+    path.reverse()
+    return path
+
+
+def _old_dfs(initial: T, goal_test: typing.Callable[[T], bool],
+             successors: typing.Callable[[T], typing.List[T]]) -> typing.Optional[_OldNode]:
+    frontier: typing.List[_OldNode] = [_OldNode(initial, None)]
+    explored: typing.Set[T] = {initial}
+    while frontier:
+        current: _OldNode = frontier.pop()
+        if goal_test(current.state):
+            return current
+        for child in successors(current.state):
+            if child not in explored:
+                explored.add(child)
+                frontier.append(_OldNode(child, current))
+    return None
+
+
+def _old_bfs(initial: T, goal_test: typing.Callable[[T], bool],
+             successors: typing.Callable[[T], typing.List[T]]) -> typing.Optional[_OldNode]:
+    frontier: typing.Deque[_OldNode] = collections.deque([_OldNode(initial, None)])
+    explored: typing.Set[T] = {initial}
+    while frontier:
+        current: _OldNode = frontier.popleft()
+        if goal_test(current.state):
+            return current
+        for child in successors(current.state):
+            if child not in explored:
+                explored.add(child)
+                frontier.append(_OldNode(child, current))
+    return None
+
+
+def _old_astar(initial: T, goal_test: typing.Callable[[T], bool],
+               successors: typing.Callable[[T], typing.List[T]],
+               heuristic: typing.Callable[[T], float]) -> typing.Optional[_OldNode]:
+    frontier: typing.List[_OldNode] = [_OldNode(initial, None, 0.0, heuristic(initial))]
+    explored: typing.Dict[T, float] = {initial: 0.0}
+    while frontier:
+        current: _OldNode = heapq.heappop(frontier)
+        if goal_test(current.state):
+            return current
+        for child in successors(current.state):
+            new_cost: float = current.cost+1
+            if child not in explored or explored[child] > new_cost:
+                explored[child] = new_cost
+                heapq.heappush(frontier, _OldNode(child, current, new_cost, heuristic(child)))
+    return None
+
+
+if __name__ == "__main__":
+    size: int = 700
+    random.seed(1)
+    maze: Maze = Maze(size, size, 0.2, goal=MazeLocation(size-1, size-1))
+    searches: typing.Dict[str, typing.Tuple[typing.Callable[[], typing.Any], typing.Callable[[], typing.Any]]] = {
+        "dfs": (lambda: _old_dfs(maze.start, maze.goal_test, maze.successors),
+                lambda: dfs(maze.start, maze.goal_test, maze.successors)),
+        "bfs": (lambda: _old_bfs(maze.start, maze.goal_test, maze.successors),
+                lambda: bfs(maze.start, maze.goal_test, maze.successors)),
+        "astar": (lambda: _old_astar(maze.start, maze.goal_test, maze.successors,
+                                     manhattan_distance(maze.goal)),
+                  lambda: astar(maze.start, maze.goal_test, maze.successors,
+                                manhattan_distance(maze.goal))),
+        # a heuristic with few ties, most estimates are distinct
+        "astar euclidean": (lambda: _old_astar(maze.start, maze.goal_test, maze.successors,
+                                               euclidian_distance(maze.goal)),
+                            lambda: astar(maze.start, maze.goal_test, maze.successors,
+                                          euclidian_distance(maze.goal))),
+    }
+    print(f"{size}x{size} maze")
+    for name, (old, new) in searches.items():
+        for layout, search, to_path in (("nodes", old, _old_path), ("arrays", new, node_to_path)):
+            start: float = time.perf_counter()
+            search()
+            elapsed: float = time.perf_counter()-start
+            tracemalloc.start()
+            node = search()
+            peak: int = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            length: int = 0 if node is None else len(to_path(node))
+            print(f"{name:15} {layout:6}: {elapsed:.2f}s, peak {peak / 2**20:.1f} MiB, path length {length}")
@@ -1,6 +1,11 @@
 # constraint-satisfaction proЬlems CSP
 import typing
 import abc
+import random
+import heapq
+import collections
+import dataclasses
+import time
 
 V = typing.TypeVar('V')  # variable
 D = typing.TypeVar('D')     # domain
@@ -14,6 +19,188 @@ class Constraint(typing.Generic[V, D], abc.ABC):
     def satisfied(self, assignment: typing.Dict[V, D]) -> bool:
         ...
 
+    # is the constraint still satisfied after variable = value was added to
+    # assignment (assignment[variable] is value), given that it was before.
+    # override it to look only at what the new value can break, by default
+    # the whole assignment is checked
+    def satisfied_with(self, variable: V, value: D, assignment: typing.Dict[V, D]) -> bool:
+        return self.satisfied(assignment)
+
+    # the values of other, an unassigned variable of the constraint, that
+    # are still possible after variable = value was added to assignment.
+    # forward checking calls it; override it when the constraint can tell
+    # without trying every value
+    def remaining_values(self, variable: V, value: D, other: V, values: typing.List[D],
+                         assignment: typing.Dict[V, D]) -> typing.List[D]:
+        kept: typing.List[D] = []
+        try:
+            for candidate in values:
+                assignment[other] = candidate
+                if self.satisfied_with(other, candidate, assignment):
+                    kept.append(candidate)
+        finally:
+            assignment.pop(other, None)
+        return kept
+
+    # for min_conflicts: a new ConflictCounter for this constraint, which
+    # holds whatever state one run needs. override it to return a subclass
+    # that counts faster than asking satisfied
+    def conflict_counter(self) -> "ConflictCounter[V, D]":
+        return ConflictCounter(self)
+
+
+# conflicts of one constraint during one min_conflicts run. the run tells
+# it every value it gives a variable or takes back, so a subclass can keep
+# counters that make conflicts cheap; the constraint itself stays as it was
+class ConflictCounter(typing.Generic[V, D]):
+    def __init__(self, constraint: Constraint[V, D]) -> None:
+        self.constraint: Constraint[V, D] = constraint
+
+    # how many conflicts variable = value has with the other variables of
+    # the constraint in assignment, which may hold a different value of
+    # variable. by default 1 when the constraint is broken, constraints
+    # over many variables should count pairs instead
+    def conflicts(self, variable: V, value: D, assignment: typing.Dict[V, D]) -> int:
+        scope: typing.Dict[V, D] = {v: assignment[v] for v in self.constraint.variables if v in assignment}
+        scope[variable] = value
+        return 0 if self.constraint.satisfied(scope) else 1
+
+    # the variables in conflict with variable = value, which is in
+    # assignment, or those that can be found cheaply. by default every
+    # other variable of the constraint when it is broken
+    def conflicting(self, variable: V, value: D, assignment: typing.Dict[V, D]) -> typing.List[V]:
+        if self.conflicts(variable, value, assignment) == 0:
+            return []
+        return [v for v in self.constraint.variables if v != variable]
+
+    def assigned(self, variable: V, value: D) -> None:
+        pass
+
+    def unassigned(self, variable: V, value: D) -> None:
+        pass
+
+    # with a sample: up to count values of variable that are likely to have
+    # few conflicts, tried besides the random ones
+    def promising_values(self, variable: V, count: int, choose: random.Random) -> typing.Iterable[D]:
+        return ()
+
+
+# counters a search fills in when it is passed one
+@dataclasses.dataclass
+class CSPStats:
+    nodes: int = 0  # values tried
+    backtracks: int = 0  # variables for which no value worked
+    pruned: int = 0  # values removed from domains by propagation
+    total_time: float = 0.0
+
+
+# current domains during a search. a domain is never changed in place,
+# it is replaced and the old list goes onto the trail, so undoing back to
+# a mark restores every domain changed since
+class _Domains(typing.Generic[V, D]):
+    def __init__(self, domains: typing.Dict[V, typing.List[D]]) -> None:
+        self.current: typing.Dict[V, typing.List[D]] = dict(domains)
+        self._trail: typing.List[typing.Tuple[V, typing.List[D]]] = []
+        self.on_change: typing.Optional[typing.Callable[[V], None]] = None
+
+    def mark(self) -> int:
+        return len(self._trail)
+
+    def set(self, variable: V, values: typing.List[D]) -> None:
+        self._trail.append((variable, self.current[variable]))
+        self.current[variable] = values
+        if self.on_change is not None:
+            self.on_change(variable)
+
+    def undo(self, mark: int) -> None:
+        while len(self._trail) > mark:
+            variable, values = self._trail.pop()
+            self.current[variable] = values
+            if self.on_change is not None:
+                self.on_change(variable)
+
+
+Arc = typing.Tuple[V, V, Constraint[V, D]]  # revise the first variable against the second
+Symmetry = typing.Callable[[V, D, typing.Dict[V, D]], int]  # see CSP.count_solutions
+
+
+# variable_order="declared": the first unassigned variable of csp.variables.
+# variables before the position are all assigned, so the scan picks up
+# where the last one stopped
+class _DeclarationOrder(typing.Generic[V, D]):
+    def __init__(self, csp: "CSP[V, D]", domains: _Domains[V, D]) -> None:
+        self._variables: typing.List[V] = csp.variables
+        self._positions: typing.Dict[V, int] = {v: i for i, v in enumerate(csp.variables)}
+        self._position: int = 0
+
+    def select(self, assignment: typing.Dict[V, D]) -> V:
+        while self._variables[self._position] in assignment:
+            self._position += 1
+        return self._variables[self._position]
+
+    def unassigned(self, variable: V) -> None:
+        self._position = min(self._position, self._positions[variable])
+
+
+# variable_order="mrv": the unassigned variable with the fewest values left
+# in its current domain, ties go to the one with the most unassigned
+# neighbors (the degree heuristic), then to declaration order. degrees are
+# kept up to date: selecting a variable lowers its neighbors' and
+# unassigning it raises them again. the heap gets an entry whenever a
+# domain or a degree changes or a variable is unassigned, entries that
+# are out of date are dropped when they come to the top
+class _MinimumRemainingValues(typing.Generic[V, D]):
+    def __init__(self, csp: "CSP[V, D]", domains: _Domains[V, D], assignment: typing.Dict[V, D]) -> None:
+        self._variables: typing.List[V] = csp.variables
+        self._domains: _Domains[V, D] = domains
+        self._neighbors: typing.Dict[V, typing.Dict[V, typing.List[Constraint[V, D]]]] = csp._neighbors
+        self._degrees: typing.Dict[V, int] = {
+            v: sum(1 for n in csp._neighbors[v] if n not in assignment) for v in csp.variables}
+        self._positions: typing.Dict[V, int] = {v: i for i, v in enumerate(csp.variables)}
+        self._heap: typing.List[typing.Tuple[int, int, int, V]] = []
+        for variable in csp.variables:
+            self._push(variable)
+        domains.on_change = self._push
+
+    def _push(self, variable: V) -> None:
+        heapq.heappush(self._heap, (len(self._domains.current[variable]), -self._degrees[variable],
+                                    self._positions[variable], variable))
+
+    def unassigned(self, variable: V) -> None:
+        for neighbor in self._neighbors[variable]:
+            self._degrees[neighbor] += 1
+            self._push(neighbor)
+        self._push(variable)
+
+    def select(self, assignment: typing.Dict[V, D]) -> V:
+        if len(self._heap) > 4 * len(self._variables):  # mostly stale, start over
+            self._heap = [(len(self._domains.current[v]), -self._degrees[v], self._positions[v], v)
+                          for v in self._variables if v not in assignment]
+            heapq.heapify(self._heap)
+        while True:
+            size, degree, _, variable = self._heap[0]
+            if variable not in assignment and size == len(self._domains.current[variable]) \
+                    and -degree == self._degrees[variable]:
+                break
+            heapq.heappop(self._heap)
+        for neighbor in self._neighbors[variable]:
+            self._degrees[neighbor] -= 1
+            if neighbor not in assignment:
+                self._push(neighbor)
+        return variable
+
+
+# settings and state of one backtracking_search call
+@dataclasses.dataclass
+class _Search(typing.Generic[V, D]):
+    domains: _Domains[V, D]
+    propagation: typing.Optional[str]
+    order: typing.Union[_DeclarationOrder[V, D], _MinimumRemainingValues[V, D]]
+    least_constraining: bool
+    stats: typing.Optional[CSPStats]
+    stop: typing.Optional[typing.Callable[[], bool]]
+    symmetry: typing.Optional[Symmetry]
+
 
 class CSP(typing.Generic[V, D]):
     def __init__(self, variables: typing.List[V],
@@ -21,6 +208,15 @@ class CSP(typing.Generic[V, D]):
         self.variables: typing.List[V] = variables
         self.domains: typing.Dict[V, typing.List[D]] = domains
         self.constraints: typing.Dict[V, typing.List[Constraint[V, D]]] = {}
+        # variables sharing constraints with the constraints they share, and
+        # the other end of binary constraints. filled in by _index_constraints
+        # when a search starts: one constraint over n variables makes n*n
+        # pairs, which min_conflicts never needs
+        self._neighbors: typing.Dict[V, typing.Dict[V, typing.List[Constraint[V, D]]]] = \
+            collections.defaultdict(dict)
+        self._binary: typing.Dict[V, typing.List[typing.Tuple[V, Constraint[V, D]]]] = \
+            collections.defaultdict(list)
+        self._unindexed: typing.List[Constraint[V, D]] = []
         for variable in self.variables:
             self.constraints[variable] = []
             if variable not in self.domains:
@@ -29,10 +225,23 @@ class CSP(typing.Generic[V, D]):
 
     def add_constraint(self, constraint: Constraint[V, D]) -> None:
         for variable in constraint.variables:
-            if variable not in self.variables:
+            if variable not in self.constraints:
                 raise LookupError("Variable in constraint not in CSP")
             else:
                 self.constraints[variable].append(constraint)
+        self._unindexed.append(constraint)
+
+    def _index_constraints(self) -> None:
+        for constraint in self._unindexed:
+            for variable in constraint.variables:
+                for other in constraint.variables:
+                    if other != variable:
+                        self._neighbors[variable].setdefault(other, []).append(constraint)
+            if len(constraint.variables) == 2:
+                first, second = constraint.variables
+                self._binary[first].append((second, constraint))
+                self._binary[second].append((first, constraint))
+        self._unindexed.clear()
 
     def consistent(self, variable: V, assignment: typing.Dict[V, D]) -> bool:
         for constraint in self.constraints[variable]:
@@ -40,21 +249,296 @@ class CSP(typing.Generic[V, D]):
                 return False
         return True
 
-    def backtracking_search(self, assignment: typing.Dict[V, D] = {}) -> typing.Optional[typing.Dict[V, D]]:
-        if len(assignment) == len(self.variables):
-            return assignment
+    # consistent for the searches, which add one variable at a time:
+    # variable is in assignment and the rest of it is consistent already,
+    # so the constraints only check what the new value can break
+    def _consistent_with(self, variable: V, assignment: typing.Dict[V, D]) -> bool:
+        value: D = assignment[variable]
+        for constraint in self.constraints[variable]:
+            if not constraint.satisfied_with(variable, value, assignment):
+                return False
+        return True
+
+    # propagation is None for plain backtracking, "forward" for forward
+    # checking after every assignment or "ac3" to also keep binary
+    # constraints arc consistent (AC-3 once up front and after every
+    # assignment). variable_order is "declared" to assign variables in the
+    # order of self.variables or "mrv" for minimum remaining values with
+    # the degree heuristic as tie-break, value_order is "declared" for
+    # the order of the domain or "lcv" to try the least constraining
+    # value first. stop is called before every new variable, the search
+    # gives up and returns None once it returns True
+    def backtracking_search(self, assignment: typing.Optional[typing.Dict[V, D]] = None,
+                            propagation: typing.Optional[str] = None,
+                            stats: typing.Optional[CSPStats] = None,
+                            variable_order: str = "declared",
+                            value_order: str = "declared",
+                            stop: typing.Optional[typing.Callable[[], bool]] = None
+                            ) -> typing.Optional[typing.Dict[V, D]]:
+        started: float = time.perf_counter()
+        try:
+            start: typing.Optional[typing.Tuple[typing.Dict[V, D], _Search[V, D]]] = self._start(
+                assignment, propagation, stats, variable_order, value_order, stop, None)
+            if start is None:
+                return None
+            local_assignment, search = start
+            for _ in self._solutions(local_assignment, search):
+                return local_assignment
+            return None
+        finally:
+            if stats is not None:
+                stats.total_time += time.perf_counter()-started
+
+    # every solution, each in a new dict, found one at a time as they are
+    # asked for. the options are those of backtracking_search; symmetry,
+    # if given, is called as symmetry(variable, value, assignment) for
+    # every value the search tries and returns 0 to skip the value, for
+    # values whose solutions are mirror images of solutions found anyway
+    # (see count_solutions)
+    def solutions(self, assignment: typing.Optional[typing.Dict[V, D]] = None,
+                  propagation: typing.Optional[str] = None,
+                  stats: typing.Optional[CSPStats] = None,
+                  variable_order: str = "declared",
+                  value_order: str = "declared",
+                  symmetry: typing.Optional[Symmetry] = None) -> typing.Iterator[typing.Dict[V, D]]:
+        started: float = time.perf_counter()
+        try:
+            start: typing.Optional[typing.Tuple[typing.Dict[V, D], _Search[V, D]]] = self._start(
+                assignment, propagation, stats, variable_order, value_order, None, symmetry)
+            if start is None:
+                return
+            local_assignment, search = start
+            for _ in self._solutions(local_assignment, search):
+                if stats is not None:
+                    stats.total_time += time.perf_counter()-started
+                try:
+                    yield dict(local_assignment)
+                finally:
+                    started = time.perf_counter()
+        finally:
+            if stats is not None:
+                stats.total_time += time.perf_counter()-started
 
-        unassigned: typing.List[V] = [
-            v for v in self.variables if v not in assignment]
+    # the number of solutions, without building them. symmetry works as
+    # for solutions, except that anything but 0 it returns is how many
+    # solutions each solution found below the value stands for: skipping
+    # mirror images with 0 and returning 2 for their counterparts keeps
+    # the count right with half of the search
+    def count_solutions(self, assignment: typing.Optional[typing.Dict[V, D]] = None,
+                        propagation: typing.Optional[str] = None,
+                        stats: typing.Optional[CSPStats] = None,
+                        variable_order: str = "declared",
+                        value_order: str = "declared",
+                        symmetry: typing.Optional[Symmetry] = None) -> int:
+        started: float = time.perf_counter()
+        try:
+            start: typing.Optional[typing.Tuple[typing.Dict[V, D], _Search[V, D]]] = self._start(
+                assignment, propagation, stats, variable_order, value_order, None, symmetry)
+            if start is None:
+                return 0
+            return sum(self._solutions(*start))
+        finally:
+            if stats is not None:
+                stats.total_time += time.perf_counter()-started
 
-        first: V = unassigned[0]
+    # checks the options, copies assignment and propagates it. None if
+    # propagation already runs a domain empty
+    def _start(self, assignment: typing.Optional[typing.Dict[V, D]], propagation: typing.Optional[str],
+               stats: typing.Optional[CSPStats], variable_order: str, value_order: str,
+               stop: typing.Optional[typing.Callable[[], bool]], symmetry: typing.Optional[Symmetry]
+               ) -> typing.Optional[typing.Tuple[typing.Dict[V, D], _Search[V, D]]]:
+        if propagation not in (None, "forward", "ac3"):
+            raise ValueError(f"unknown propagation {propagation!r}")
+        if variable_order not in ("declared", "mrv"):
+            raise ValueError(f"unknown variable order {variable_order!r}")
+        if value_order not in ("declared", "lcv"):
+            raise ValueError(f"unknown value order {value_order!r}")
+        self._index_constraints()
+        domains: _Domains[V, D] = _Domains(self.domains)
+        # constraints on a single variable: propagation only looks at
+        # constraints shared with a neighbor and then trusts the domains,
+        # so they are applied to the domains once, here
+        for variable in self.variables:
+            unary: typing.List[Constraint[V, D]] = [
+                constraint for constraint in self.constraints[variable]
+                if all(v == variable for v in constraint.variables)]
+            if unary:
+                values: typing.List[D] = [
+                    value for value in domains.current[variable]
+                    if all(constraint.satisfied_with(variable, value, {variable: value}) for constraint in unary)]
+                if len(values) < len(domains.current[variable]):
+                    if stats is not None:
+                        stats.pruned += len(domains.current[variable])-len(values)
+                    domains.set(variable, values)
+                if not values:
+                    return None
+        # the given assignment is checked a variable at a time, the search
+        # only checks the variables it assigns itself
+        local_assignment: typing.Dict[V, D] = {}
+        for variable, value in (assignment or {}).items():
+            local_assignment[variable] = value
+            if not self._consistent_with(variable, local_assignment):
+                return None
+        if propagation is not None:
+            for variable in list(local_assignment):
+                if not self._propagate(variable, local_assignment, domains, propagation, stats):
+                    return None
+            if propagation == "ac3" and not self._ac3(
+                    [(x, y, constraint) for x in self.variables if x not in local_assignment
+                     for y, constraint in self._binary[x]],
+                    local_assignment, domains, stats):
+                return None
+        order: typing.Union[_DeclarationOrder[V, D], _MinimumRemainingValues[V, D]] = \
+            _DeclarationOrder(self, domains) if variable_order == "declared" \
+            else _MinimumRemainingValues(self, domains, local_assignment)
+        return local_assignment, _Search(domains, propagation, order, value_order == "lcv",
+                                         stats, stop, symmetry)
+
+    # depth first search without recursion. assignment is changed in place
+    # and every level of the search is a frame on a stack: the variable,
+    # the values to try, how many of them were tried, the domain trail
+    # mark to undo to before the next one and the weight of the levels
+    # above. yields the weight of every solution reached, with the solution
+    # in assignment, and carries on from there when it is resumed
+    def _solutions(self, assignment: typing.Dict[V, D], search: _Search[V, D]) -> typing.Iterator[int]:
+        domains: _Domains[V, D] = search.domains
+        stats: typing.Optional[CSPStats] = search.stats
+        frames: typing.List[typing.List[typing.Any]] = []
+        weight: int = 1
+        while True:
+            if len(assignment) == len(self.variables):
+                yield weight
+            elif search.stop is not None and search.stop():
+                return
+            else:
+                variable: V = search.order.select(assignment)
+                values: typing.List[D] = domains.current[variable]
+                if search.least_constraining:
+                    values = self._least_constraining(variable, values, assignment, domains)
+                frames.append([variable, values, 0, domains.mark(), weight])
+            # find the next value that works, on this level or, once all
+            # values of a level are tried, on the levels above it
+            while frames:
+                frame: typing.List[typing.Any] = frames[-1]
+                multiplicity: int = self._assign_next(frame, assignment, search)
+                if multiplicity:
+                    weight = frame[4] * multiplicity
+                    break
+                frames.pop()
+                search.order.unassigned(frame[0])
+                if stats is not None:
+                    stats.backtracks += 1
+            else:
+                return
+
+    # undoes the last value tried for the frame's variable and tries the
+    # next ones until one is consistent (and propagation does not run a
+    # domain empty) and not skipped by the symmetry hook. returns the
+    # value's multiplicity with the value assigned, 0 when none is left
+    def _assign_next(self, frame: typing.List[typing.Any], assignment: typing.Dict[V, D],
+                     search: _Search[V, D]) -> int:
+        variable, values, tried, mark, _ = frame
+        domains: _Domains[V, D] = search.domains
+        stats: typing.Optional[CSPStats] = search.stats
+        if tried:
+            del assignment[variable]
+            domains.undo(mark)
+        while tried < len(values):
+            value: D = values[tried]
+            tried += 1
+            if stats is not None:
+                stats.nodes += 1
+            assignment[variable] = value
+            multiplicity: int = 1 if search.symmetry is None else search.symmetry(variable, value, assignment)
+            if multiplicity:
+                if search.propagation is None:
+                    if self._consistent_with(variable, assignment):
+                        frame[2] = tried
+                        return multiplicity
+                # propagation keeps only values consistent with the
+                # assignment in the domains, no need to check again
+                elif self._propagate(variable, assignment, domains, search.propagation, stats):
+                    frame[2] = tried
+                    return multiplicity
+                else:
+                    domains.undo(mark)
+            del assignment[variable]
+        return 0
+
+    # values of variable sorted by how many values of unassigned neighbors
+    # they rule out, fewest first
+    def _least_constraining(self, variable: V, values: typing.List[D], assignment: typing.Dict[V, D],
+                            domains: _Domains[V, D]) -> typing.List[D]:
+        neighbors: typing.List[V] = [n for n in self._neighbors[variable] if n not in assignment]
 
-        for value in self.domains[first]:
-            local_assignment = assignment.copy()
-            local_assignment[first] = value
-            if self.consistent(first, local_assignment):
-                result: typing.Optional[typing.Dict[V, D]] = self.backtracking_search(
-                    local_assignment)
-                if result is not None:
-                    return result
-        return None
+        def ruled_out(value: D) -> int:
+            assignment[variable] = value
+            try:
+                return sum(1 for neighbor in neighbors for other in domains.current[neighbor]
+                           if not self._allows(neighbor, other, assignment))
+            finally:
+                del assignment[variable]
+
+        return sorted(values, key=ruled_out)
+
+    # would variable = value be consistent with assignment
+    def _allows(self, variable: V, value: D, assignment: typing.Dict[V, D]) -> bool:
+        assignment[variable] = value
+        try:
+            return self._consistent_with(variable, assignment)
+        finally:
+            del assignment[variable]
+
+    # forward checking after variable was assigned, only the constraints
+    # shared with variable can rule out more values. then AC-3 from the
+    # domains that shrank. False if a domain ran empty
+    def _propagate(self, variable: V, assignment: typing.Dict[V, D], domains: _Domains[V, D],
+                   propagation: typing.Optional[str], stats: typing.Optional[CSPStats]) -> bool:
+        value: D = assignment[variable]
+        domains.set(variable, [value])
+        changed: typing.List[V] = []
+        for neighbor, shared in self._neighbors[variable].items():
+            if neighbor in assignment:
+                continue
+            values: typing.List[D] = domains.current[neighbor]
+            kept: typing.List[D] = values
+            for constraint in shared:
+                kept = constraint.remaining_values(variable, value, neighbor, kept, assignment)
+            if len(kept) < len(values):
+                if stats is not None:
+                    stats.pruned += len(values)-len(kept)
+                if not kept:
+                    return False
+                domains.set(neighbor, kept)
+                changed.append(neighbor)
+        if propagation == "ac3":
+            return self._ac3([(x, y, constraint) for y in changed for x, constraint in self._binary[y]
+                              if x not in assignment], assignment, domains, stats)
+        return True
+
+    # AC-3 over binary constraints, starting from arcs. unassigned
+    # variables lose values that have no support in the other domain
+    def _ac3(self, arcs: typing.List[Arc], assignment: typing.Dict[V, D],
+             domains: _Domains[V, D], stats: typing.Optional[CSPStats]) -> bool:
+        queue: typing.Deque[Arc] = collections.deque(arcs)
+        queued: typing.Set[Arc] = set(arcs)
+        while queue:
+            arc: Arc = queue.popleft()
+            queued.discard(arc)
+            x, y, constraint = arc
+            values: typing.List[D] = domains.current[x]
+            supports: typing.List[D] = domains.current[y]
+            kept: typing.List[D] = [value for value in values
+                                    if any(constraint.satisfied({x: value, y: support})
+                                           for support in supports)]
+            if len(kept) < len(values):
+                if stats is not None:
+                    stats.pruned += len(values)-len(kept)
+                if not kept:
+                    return False
+                domains.set(x, kept)
+                for z, other in self._binary[x]:
+                    if z != y and z not in assignment and (z, x, other) not in queued:
+                        queue.append((z, x, other))
+                        queued.add((z, x, other))
+        return True
@@ -0,0 +1,118 @@
+import typing
+import itertools
+import time
+from csp import CSP, CSPStats, Constraint
+from map_coloring import random_map
+from queens import queens_csp, queens_mirror, count_queens
+
+COLORS: typing.List[str] = ["red", "green", "blue"]
+
+
+def run(name: str, csp: CSP, **options: typing.Any) -> None:
+    stats: CSPStats = CSPStats()
+    solution = csp.backtracking_search(stats=stats, **options)
+    settings: str = ", ".join(f"{key}={value}" for key, value in options.items())
+    print(f"{name:28} {settings:66} {'solved' if solution is not None else 'no solution':11} "
+          f"{stats.nodes:8} nodes {stats.backtracks:8} backtracks "
+          f"{stats.pruned:8} pruned {stats.total_time:8.3f}s")
+
+
+# value is not allowed for variable, a constraint on one variable
+class _Forbid(Constraint[str, str]):
+    def __init__(self, variable: str, value: str) -> None:
+        super().__init__([variable])
+        self.variable: str = variable
+        self.value: str = value
+
+    def satisfied(self, assignment: typing.Dict[str, str]) -> bool:
+        return assignment.get(self.variable) != self.value
+
+
+# every search option counts the same solutions as trying all assignments,
+# also with constraints on one variable, which propagation used to skip
+def check_options() -> None:
+    single: CSP[str, str] = CSP(["WA"], {"WA": ["red", "green"]})
+    single.add_constraint(_Forbid("WA", "red"))
+    problems: typing.List[CSP[str, str]] = [single]
+    for seed in range(5):
+        csp: CSP[str, str] = random_map(7, 3, COLORS, seed)
+        csp.add_constraint(_Forbid("region0", "red"))
+        csp.add_constraint(_Forbid(f"region{seed + 1}", "green"))
+        problems.append(csp)
+    for csp in problems:
+        constraints: typing.Set[Constraint] = {c for cs in csp.constraints.values() for c in cs}
+        expected: int = sum(
+            all(c.satisfied(dict(zip(csp.variables, values))) for c in constraints)
+            for values in itertools.product(*(csp.domains[v] for v in csp.variables)))
+        for propagation in (None, "forward", "ac3"):
+            for variable_order in ("declared", "mrv"):
+                for value_order in ("declared", "lcv"):
+                    options: typing.Dict[str, typing.Any] = {
+                        "propagation": propagation, "variable_order": variable_order, "value_order": value_order}
+                    assert csp.count_solutions(**options) == expected, options
+                    solution = csp.backtracking_search(**options)
+                    assert (solution is None) == (expected == 0), options
+                    assert solution is None or all(c.satisfied(solution) for c in constraints), options
+    print(f"{len(problems)} small problems: every search option agrees with brute force")
+
+
+if __name__ == "__main__":
+    check_options()
+
+    # three colorable maps, five borders per region on average. in
+    # declaration order plain backtracking takes minutes from about 60
+    # regions on, forward checking from about 100
+    for regions, seed, propagations in ((30, 1, (None, "forward", "ac3")),
+                                        (40, 1, (None, "forward", "ac3")),
+                                        (60, 2, ("forward", "ac3")),
+                                        (100, 0, ("ac3",))):
+        for propagation in propagations:
+            run(f"map, {regions} regions (seed {seed})",
+                random_map(regions, 5, COLORS, seed), propagation=propagation)
+
+    # variable and value ordering, left out are the runs that take more
+    # than 15s: declaration order on 200 regions, plain backtracking on
+    # 20 queens unless lcv picks the values
+    orders: typing.List[typing.Tuple[str, str]] = [
+        ("declared", "declared"), ("declared", "lcv"), ("mrv", "declared"), ("mrv", "lcv")]
+    for propagation in ("forward", "ac3"):
+        for variable_order, value_order in orders:
+            if (propagation, variable_order) != ("forward", "declared"):
+                run("map, 100 regions (seed 0)", random_map(100, 5, COLORS, 0), propagation=propagation,
+                    variable_order=variable_order, value_order=value_order)
+    for propagation in ("forward", "ac3"):
+        for value_order in ("declared", "lcv"):
+            run("map, 200 regions (seed 1)", random_map(200, 5, COLORS, 1), propagation=propagation,
+                variable_order="mrv", value_order=value_order)
+    for n in (16, 20):
+        for propagation in (None, "forward"):
+            for variable_order, value_order in orders:
+                if n == 20 and value_order == "declared" and (propagation, variable_order) != ("forward", "mrv"):
+                    continue
+                if n == 16 and propagation is None and value_order == "lcv":
+                    continue
+                run(f"{n} queens", queens_csp(n), propagation=propagation,
+                    variable_order=variable_order, value_order=value_order)
+
+    # thousands of variables, four colors and four borders per region
+    for regions in (1000, 5000, 10000):
+        run(f"map, {regions} regions (seed 1)", random_map(regions, 4, COLORS + ["yellow"], 1),
+            propagation="forward", variable_order="mrv")
+
+    # QueensConstraint checks only the new queen through satisfied_with
+    for n in (64, 100):
+        run(f"{n} queens", queens_csp(n), propagation="forward", variable_order="mrv")
+
+    # counting every solution, with and without the mirror symmetry
+    for n in (8, 10, 12):
+        for symmetry in (None, queens_mirror(n)):
+            stats = CSPStats()
+            count: int = queens_csp(n).count_solutions(propagation="forward", stats=stats, symmetry=symmetry)
+            print(f"{n} queens: {count} solutions{', mirror' if symmetry else ''}, "
+                  f"{stats.nodes} nodes {stats.total_time:.3f}s")
+
+    # the same counts with bitmasks in place of the engine, up to 15 queens
+    for n in (12, 14, 15):
+        started: float = time.perf_counter()
+        count = count_queens(n)
+        print(f"{n} queens: {count} solutions, bitmasks and mirror, {time.perf_counter()-started:.3f}s")
@@ -1,5 +1,6 @@
 import typing
-from csp import Constraint, CSP
+import random
+from csp import Constraint, ConflictCounter, CSP
 
 
 class MapColoringConstraint(Constraint[str, str]):
@@ -13,6 +14,55 @@ class MapColoringConstraint(Constraint[str, str]):
             return True
         return assignment[self.place1] != assignment[self.place2]
 
+    def satisfied_with(self, variable: str, value: str, assignment: typing.Dict[str, str]) -> bool:
+        other: str = self.place2 if variable == self.place1 else self.place1
+        return other not in assignment or assignment[other] != value
+
+    def remaining_values(self, variable: str, value: str, other: str, values: typing.List[str],
+                         assignment: typing.Dict[str, str]) -> typing.List[str]:
+        return [color for color in values if color != value]
+
+    def conflict_counter(self) -> "MapColoringCounter":
+        return MapColoringCounter(self)
+
+
+# a border is one conflict when both sides have the same color
+class MapColoringCounter(ConflictCounter[str, str]):
+    def __init__(self, constraint: MapColoringConstraint) -> None:
+        super().__init__(constraint)
+        self.place1: str = constraint.place1
+        self.place2: str = constraint.place2
+
+    def conflicts(self, variable: str, value: str, assignment: typing.Dict[str, str]) -> int:
+        other: str = self.place2 if variable == self.place1 else self.place1
+        return 1 if assignment.get(other) == value else 0
+
+
+# a made up map for benchmarks: every region gets a hidden color and
+# borders are drawn at random between regions of different hidden colors,
+# so there always is a solution, on average each region has `borders`
+# neighbors. raises ValueError when there are not enough such pairs
+def random_map(regions: int, borders: float, colors: typing.List[str],
+               seed: typing.Optional[int] = None) -> CSP[str, str]:
+    choose: random.Random = random.Random(seed)
+    names: typing.List[str] = [f"region{i}" for i in range(regions)]
+    hidden: typing.List[int] = [choose.randrange(len(colors)) for _ in range(regions)]
+    csp: CSP[str, str] = CSP(names, {name: list(colors) for name in names})
+    # pairs of regions with different hidden colors, the most borders there can be
+    sizes: typing.List[int] = [hidden.count(color) for color in range(len(colors))]
+    pairs: int = (regions * regions - sum(size * size for size in sizes)) // 2
+    wanted: int = int(regions * borders / 2)
+    if wanted > pairs:
+        raise ValueError(f"{regions} regions have room for {pairs} borders, not {wanted}")
+    drawn: typing.Set[typing.Tuple[int, int]] = set()
+    while len(drawn) < wanted:
+        i: int = choose.randrange(regions)
+        j: int = choose.randrange(regions)
+        if hidden[i] != hidden[j] and (min(i, j), max(i, j)) not in drawn:
+            drawn.add((min(i, j), max(i, j)))
+            csp.add_constraint(MapColoringConstraint(names[i], names[j]))
+    return csp
+
 
 if __name__ == "__main__":
     variaЬles: typing.List[str] = ["Western Australia", "Northern Territory", "South Australia",
@@ -0,0 +1,222 @@
+import typing
+import random
+import time
+from csp import CSP, CSPStats, ConflictCounter, V, D
+
+
+# the variables in conflict, in a list for picking one at random and a
+# dict of positions for adding and removing in constant time. a variable
+# stays in until it is picked and found free of conflicts
+class _Conflicted(typing.Generic[V]):
+    def __init__(self) -> None:
+        self.variables: typing.List[V] = []
+        self._positions: typing.Dict[V, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def add(self, variable: V) -> None:
+        if variable not in self._positions:
+            self._positions[variable] = len(self.variables)
+            self.variables.append(variable)
+
+    def remove(self, variable: V) -> None:
+        position: int = self._positions.pop(variable)
+        last: V = self.variables.pop()
+        if last != variable:
+            self.variables[position] = last
+            self._positions[last] = position
+
+
+# min-conflicts local search: every variable gets a value, greedily with
+# the fewest conflicts in declaration order (or from initial), then a
+# variable in conflict is picked at random and moved to the value with
+# the fewest conflicts, ties broken at random, until there are none left
+# or max_steps moves or time_limit seconds are used up. with probability
+# walk the value is random instead (a random walk step), and the value a
+# variable just left is tabu for it for the next `tabu` steps unless it
+# has no conflicts. sample, if given, is for domains too large to try
+# every value: up to sample values from ConflictCounter.promising_values, then
+# sample random ones and the current one are tried, stopping at the
+# first without conflicts. returns the best assignment found and its number of
+# violations: violated constraints, or attacking pairs for constraints
+# that count pairs in their conflicts method, 0 for a solution. stats
+# gets the number of moves in nodes.
+#
+# conflicts come from a ConflictCounter per constraint, built by
+# Constraint.conflict_counter for this run alone, which can keep counters
+# updated through assigned and unassigned. a move only recomputes the
+# conflicts of the moved variable, the total changes by the difference.
+# variables it now conflicts with come from ConflictCounter.conflicting,
+# the ones it cannot name are found by a full rescan once nothing known
+# to be in conflict is left
+def min_conflicts(csp: CSP[V, D], max_steps: int = 1_000_000, time_limit: typing.Optional[float] = None,
+                  sample: typing.Optional[int] = None, walk: float = 0.1, tabu: int = 10,
+                  initial: typing.Optional[typing.Dict[V, D]] = None, seed: typing.Optional[int] = None,
+                  stats: typing.Optional[CSPStats] = None) -> typing.Tuple[typing.Dict[V, D], int]:
+    started: float = time.perf_counter()
+    choose: random.Random = random.Random(seed)
+    # a counter for each constraint, kept for this run only, listed per
+    # variable like csp.constraints
+    made: typing.Dict[int, ConflictCounter[V, D]] = {}
+    counters: typing.Dict[V, typing.List[ConflictCounter[V, D]]] = {}
+    for variable in csp.variables:
+        counters[variable] = []
+        for constraint in csp.constraints[variable]:
+            if id(constraint) not in made:
+                made[id(constraint)] = constraint.conflict_counter()
+            counters[variable].append(made[id(constraint)])
+    assignment: typing.Dict[V, D] = {}
+
+    def conflicts(variable: V, value: D) -> int:
+        count: int = 0
+        for counter in counters[variable]:
+            count += counter.conflicts(variable, value, assignment)
+        return count
+
+    def place(variable: V, value: D) -> None:
+        assignment[variable] = value
+        for counter in counters[variable]:
+            counter.assigned(variable, value)
+
+    def lift(variable: V) -> D:
+        value: D = assignment.pop(variable)
+        for counter in counters[variable]:
+            counter.unassigned(variable, value)
+        return value
+
+    # every value, or what the constraints suggest, a random sample and
+    # then the current value, drawn only as they are tried
+    def candidates(variable: V, current: typing.Optional[D] = None) -> typing.Iterable[D]:
+        domain: typing.List[D] = csp.domains[variable]
+        if sample is None or len(domain) <= sample:
+            return domain
+        return sampled(variable, domain, current, sample)
+
+    def sampled(variable: V, domain: typing.List[D], current: typing.Optional[D], count: int) -> typing.Iterator[D]:
+        for counter in counters[variable]:
+            yield from counter.promising_values(variable, count, choose)
+        for _ in range(count):
+            yield domain[int(choose.random() * len(domain))]
+        if current is not None:
+            yield current
+
+    # value with the fewest conflicts for variable, which is unassigned,
+    # and their number. a sample stops at the first value without any
+    def least_conflicts(variable: V, values: typing.Iterable[D],
+                        forbidden: typing.Optional[D] = None) -> typing.Tuple[D, int]:
+        best: typing.List[D] = []
+        fewest: int = -1
+        for value in values:
+            count: int = conflicts(variable, value)
+            if value == forbidden and count > 0:
+                continue
+            if count < fewest or fewest < 0:
+                fewest = count
+                best = [value]
+                if count == 0 and sample is not None:
+                    break
+            elif count == fewest:
+                best.append(value)
+        if not best:  # everything but the tabu value was sampled away
+            assert forbidden is not None
+            return forbidden, conflicts(variable, forbidden)
+        return choose.choice(best), fewest
+
+    conflicted: _Conflicted[V] = _Conflicted()
+
+    def add_conflicts(variable: V, value: D) -> None:
+        conflicted.add(variable)
+        for counter in counters[variable]:
+            for other in counter.conflicting(variable, value, assignment):
+                conflicted.add(other)
+
+    violations: int = 0
+    for variable in csp.variables:
+        if initial is not None and variable in initial:
+            value: D = initial[variable]
+            count: int = conflicts(variable, value)
+        else:
+            value, count = least_conflicts(variable, candidates(variable))
+        violations += count
+        place(variable, value)
+        if count > 0:
+            add_conflicts(variable, value)
+
+    best: int = violations
+    trail: typing.List[typing.Tuple[V, D]] = []  # moves since the best assignment, with the old value
+    left: typing.Dict[V, typing.Tuple[D, int]] = {}  # value each variable last left, and when
+    step: int = 0
+    while violations > 0 and step < max_steps:
+        if time_limit is not None and step % 256 == 0 and time.perf_counter()-started > time_limit:
+            break
+        if not conflicted:
+            for variable in csp.variables:
+                if conflicts(variable, assignment[variable]) > 0:
+                    conflicted.add(variable)
+            if not conflicted:
+                break
+        variable = conflicted.variables[choose.randrange(len(conflicted))]
+        current: D = assignment[variable]
+        before: int = conflicts(variable, current)
+        if before == 0:
+            conflicted.remove(variable)
+            continue
+        step += 1
+        lift(variable)
+        if walk and choose.random() < walk:
+            value = choose.choice(csp.domains[variable])
+            after: int = conflicts(variable, value)
+        else:
+            forbidden: typing.Optional[D] = None
+            if variable in left and step - left[variable][1] <= tabu:
+                forbidden = left[variable][0]
+            value, after = least_conflicts(variable, candidates(variable, current), forbidden)
+        place(variable, value)
+        violations += after-before
+        if value != current:
+            left[variable] = (current, step)
+            trail.append((variable, current))
+        if after == 0:
+            conflicted.remove(variable)
+        else:
+            add_conflicts(variable, value)
+        if violations < best:
+            best = violations
+            trail.clear()
+
+    for variable, value in reversed(trail if violations > best else []):
+        lift(variable)
+        place(variable, value)
+    if stats is not None:
+        stats.nodes += step
+        stats.total_time += time.perf_counter()-started
+    return assignment, best
+
+
+if __name__ == "__main__":
+    from queens import queens_csp
+    from map_coloring import random_map
+
+    for n in (1_000, 10_000, 100_000, 1_000_000):
+        started: float = time.perf_counter()
+        csp: CSP[int, int] = queens_csp(n)
+        built: float = time.perf_counter()-started
+        stats: CSPStats = CSPStats()
+        solution, violations = min_conflicts(csp, sample=50, seed=1, stats=stats)
+        assert n > 1_000 or csp.constraints[1][0].satisfied(solution) == (violations == 0)
+        print(f"{n} queens: {violations} violations, {stats.nodes} moves, "
+              f"{stats.total_time:.2f}s (+{built:.2f}s to build)")
+    # on average 3 borders per region is easy, 4 is close to where random
+    # maps stop being 3-colorable and local search gets stuck
+    for regions, borders in ((10_000, 3), (100_000, 3), (10_000, 4)):
+        started = time.perf_counter()
+        csp_map: CSP[str, str] = random_map(regions, borders, ["red", "green", "blue"], 1)
+        built = time.perf_counter()-started
+        stats = CSPStats()
+        coloring, violations = min_conflicts(csp_map, time_limit=10, seed=1, stats=stats)
+        broken: typing.Set[int] = {id(constraint) for constraints in csp_map.constraints.values()
+                                   for constraint in constraints if not constraint.satisfied(coloring)}
+        assert violations == len(broken)
+        print(f"map, {regions} regions, {borders} borders each: {violations} violations, "
+              f"{stats.nodes} moves, {stats.total_time:.2f}s (+{built:.2f}s to build)")
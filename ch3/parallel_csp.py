@@ -0,0 +1,153 @@
+import typing
+import os
+import time
+import pickle
+import multiprocessing
+import concurrent.futures
+from csp import CSP, CSPStats, V, D
+
+# state of a worker process, set once by _start_worker
+_csp: typing.Optional[CSP] = None
+_cancelled: typing.Any = None  # shared multiprocessing.Value, nonzero once a solution is found
+
+
+# per worker process: subproblems searched and seconds spent on them
+class ParallelReport:
+    def __init__(self) -> None:
+        self.subproblems: int = 0  # generated
+        self.workers: typing.Dict[int, typing.List[float]] = {}
+        self.nodes: int = 0
+        self.total_time: float = 0.0
+
+    def add(self, pid: int, busy: float, nodes: int) -> None:
+        totals: typing.List[float] = self.workers.setdefault(pid, [0, 0.0])
+        totals[0] += 1
+        totals[1] += busy
+        self.nodes += nodes
+
+    def __str__(self) -> str:
+        searched: int = int(sum(count for count, _ in self.workers.values()))
+        lines: typing.List[str] = [
+            f"{searched} of {self.subproblems} subproblems searched, "
+            f"{self.nodes} nodes in {self.total_time:.2f}s"]
+        for pid, (count, busy) in sorted(self.workers.items()):
+            lines.append(f"  worker {pid}: {int(count)} subproblems, {busy:.2f}s busy")
+        return "\n".join(lines)
+
+
+# partial assignments of the first variables of csp.variables that are
+# consistent so far, in the order backtracking would reach them. as many
+# variables are taken as it needs to get at least `count` of them
+def split(csp: CSP[V, D], count: int) -> typing.List[typing.Dict[V, D]]:
+    prefixes: typing.List[typing.Dict[V, D]] = [{}]
+    for variable in csp.variables:
+        if len(prefixes) >= count:
+            break
+        longer: typing.List[typing.Dict[V, D]] = []
+        for prefix in prefixes:
+            for value in csp.domains[variable]:
+                prefix[variable] = value
+                if csp.consistent(variable, prefix):
+                    longer.append(dict(prefix))
+            del prefix[variable]
+        prefixes = longer
+    return prefixes
+
+
+def _start_worker(csp: CSP, cancelled: typing.Any) -> None:
+    global _csp, _cancelled
+    _csp = csp
+    _cancelled = cancelled
+
+
+# the search calls it before every variable, so it reads the shared byte
+# directly instead of asking an Event, which takes a lock every time
+def _stopped() -> bool:
+    return bool(_cancelled.value)
+
+
+# runs in a worker process
+def _search_subproblem(prefix: typing.Dict[V, D], options: typing.Dict[str, typing.Any]
+                       ) -> typing.Tuple[int, float, int, typing.Optional[typing.Dict[V, D]]]:
+    started: float = time.perf_counter()
+    assert _csp is not None
+    stats: CSPStats = CSPStats()
+    solution: typing.Optional[typing.Dict[V, D]] = None
+    if not _stopped():
+        solution = _csp.backtracking_search(prefix, stats=stats, stop=_stopped, **options)
+    return os.getpid(), time.perf_counter()-started, stats.nodes, solution
+
+
+# backtracking_search on a process pool. the search tree is split into
+# subproblems by fixing the first variables (about eight per worker);
+# they are handed out one at a time, at most two per worker in flight,
+# so a worker that finishes early gets the next one. the first solution
+# found is returned and every other worker stops its search. the other
+# keyword arguments go to backtracking_search
+def parallel_backtracking_search(csp: CSP[V, D], workers: typing.Optional[int] = None,
+                                 subproblems: typing.Optional[int] = None,
+                                 report: typing.Optional[ParallelReport] = None,
+                                 **options: typing.Any) -> typing.Optional[typing.Dict[V, D]]:
+    started: float = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    try:
+        pickle.dumps(csp)
+    except Exception as error:
+        raise TypeError(f"the CSP and its constraints must pickle to be solved in parallel: {error}") from error
+    prefixes: typing.List[typing.Dict[V, D]] = split(csp, subproblems or 8 * workers)
+    if report is not None:
+        report.subproblems += len(prefixes)
+    cancelled: typing.Any = multiprocessing.Value('b', 0, lock=False)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_start_worker, initargs=(csp, cancelled)) as executor:
+            queued: typing.Iterator[typing.Dict[V, D]] = iter(prefixes)
+            pending: typing.Set[concurrent.futures.Future] = set()
+            exhausted: bool = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < 2 * workers:
+                    prefix: typing.Optional[typing.Dict[V, D]] = next(queued, None)
+                    if prefix is None:
+                        exhausted = True
+                    else:
+                        pending.add(executor.submit(_search_subproblem, prefix, options))
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    pid, busy, nodes, solution = future.result()
+                    if report is not None:
+                        report.add(pid, busy, nodes)
+                    if solution is not None:
+                        cancelled.value = 1
+                        for other in pending:
+                            other.cancel()
+                        return solution
+            return None
+    finally:
+        if report is not None:
+            report.total_time += time.perf_counter()-started
+
+
+if __name__ == "__main__":
+    from queens import queens_csp
+    from map_coloring import random_map
+
+    problems: typing.List[typing.Tuple[str, typing.Callable[[], CSP], typing.Dict[str, typing.Any]]] = [
+        ("20 queens", lambda: queens_csp(20), {"propagation": "forward"}),
+        ("map, 250 regions (seed 1)", lambda: random_map(250, 5, ["red", "green", "blue"], 1),
+         {"propagation": "forward", "variable_order": "mrv"}),
+    ]
+    print(f"{os.cpu_count()} cores")
+    for name, build, options in problems:
+        stats: CSPStats = CSPStats()
+        solution = build().backtracking_search(stats=stats, **options)
+        serial: float = stats.total_time
+        print(f"{name}: single process {serial:.2f}s, {stats.nodes} nodes")
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            csp: CSP = build()
+            report: ParallelReport = ParallelReport()
+            found = parallel_backtracking_search(csp, workers, report=report, **options)
+            assert (found is None) == (solution is None)
+            assert found is None or all(constraint.satisfied(found) for constraints in csp.constraints.values()
+                                        for constraint in constraints)
+            print(f"{workers} worker(s): speedup {serial / report.total_time:.2f}x, {report}")
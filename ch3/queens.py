@@ -1,5 +1,6 @@
 import typing
-from csp import Constraint, CSP
+import random
+from csp import Constraint, ConflictCounter, CSP
 
 
 class QueensConstraint(Constraint[int, int]):
@@ -16,10 +17,144 @@ class QueensConstraint(Constraint[int, int]):
                     q2r: int = assignment[q2c]  # q2r queen on 2nd row
                     if q1r == q2r:  # the same row
                         return False
-                    if(abs(q1r-q2r) == abs(q1c-q2r)):  # the same diagonal
+                    if(abs(q1r-q2r) == abs(q1c-q2c)):  # the same diagonal
                         return False
         return True
 
+    # only the new queen can be attacked or attack
+    def satisfied_with(self, variable: int, value: int, assignment: typing.Dict[int, int]) -> bool:
+        for column, row in assignment.items():
+            if column != variable and (row == value or abs(row-value) == abs(column-variable)):
+                return False
+        return True
+
+    def remaining_values(self, variable: int, value: int, other: int, values: typing.List[int],
+                         assignment: typing.Dict[int, int]) -> typing.List[int]:
+        distance: int = abs(other-variable)
+        return [row for row in values if row != value and abs(row-value) != distance]
+
+    def conflict_counter(self) -> "QueensCounter":
+        return QueensCounter(self)
+
+
+# queens placed by one min_conflicts run, per row, per diagonal
+# (row-column shifted by n) and per antidiagonal (row+column). each entry
+# is the number of queens plus the sum of their columns shifted past it,
+# which names the other queen when there are two
+class QueensCounter(ConflictCounter[int, int]):
+    def __init__(self, constraint: QueensConstraint) -> None:
+        super().__init__(constraint)
+        n: int = len(constraint.columns)
+        self._n: int = n
+        self._shift: int = (n+1).bit_length()
+        self._mask: int = (1 << self._shift)-1
+        self._rows: typing.List[int] = [0] * (n+1)
+        self._diagonals: typing.List[int] = [0] * (2*n+1)
+        self._antidiagonals: typing.List[int] = [0] * (2*n+1)
+        # rows without a queen, with the position of each in the list
+        self._empty: typing.List[int] = list(range(1, n+1))
+        self._empty_at: typing.List[int] = [-1] + list(range(n))
+
+    # queens attacking a queen on row value of column variable, in constant
+    # time from the counters
+    def conflicts(self, variable: int, value: int, assignment: typing.Dict[int, int]) -> int:
+        mask: int = self._mask
+        count: int = (self._rows[value] & mask) + (self._diagonals[value-variable+self._n] & mask) + \
+            (self._antidiagonals[value+variable] & mask)
+        if assignment.get(variable) == value:  # do not count itself
+            count -= 3
+        return count
+
+    def assigned(self, variable: int, value: int) -> None:
+        if self._rows[value] == 0:
+            position: int = self._empty_at[value]
+            last: int = self._empty.pop()
+            if last != value:
+                self._empty[position] = last
+                self._empty_at[last] = position
+        placed: int = 1 + (variable << self._shift)
+        self._rows[value] += placed
+        self._diagonals[value-variable+self._n] += placed
+        self._antidiagonals[value+variable] += placed
+
+    def unassigned(self, variable: int, value: int) -> None:
+        placed: int = 1 + (variable << self._shift)
+        self._rows[value] -= placed
+        if self._rows[value] == 0:
+            self._empty_at[value] = len(self._empty)
+            self._empty.append(value)
+        self._diagonals[value-variable+self._n] -= placed
+        self._antidiagonals[value+variable] -= placed
+
+    # the queen sharing a line with the one on row value of column
+    # variable, where it shares it with just one
+    def conflicting(self, variable: int, value: int, assignment: typing.Dict[int, int]) -> typing.List[int]:
+        lines: typing.List[int] = [self._rows[value], self._diagonals[value-variable+self._n],
+                                   self._antidiagonals[value+variable]]
+        return [(line >> self._shift)-variable for line in lines if line & self._mask == 2]
+
+    # empty rows, a queen can only be free of conflicts on one
+    def promising_values(self, variable: int, count: int, choose: random.Random) -> typing.Iterator[int]:
+        for _ in range(min(count, len(self._empty))):
+            yield self._empty[int(choose.random() * len(self._empty))]
+
+
+# n queens, one variable per column holding the row of its queen
+def queens_csp(n: int) -> CSP[int, int]:
+    columns: typing.List[int] = list(range(1, n+1))
+    rows: typing.List[int] = list(range(1, n+1))  # shared, searches never change a domain in place
+    csp: CSP[int, int] = CSP(columns, {column: rows for column in columns})
+    csp.add_constraint(QueensConstraint(columns))
+    return csp
+
+
+# symmetry hook for CSP.solutions and CSP.count_solutions: turning the
+# board upside down maps solutions onto solutions, so only those with the
+# first queen in the upper half are searched, and counted twice
+def queens_mirror(n: int) -> typing.Callable[[int, int, typing.Dict[int, int]], int]:
+    def symmetry(column: int, row: int, assignment: typing.Dict[int, int]) -> int:
+        if column != 1:
+            return 1
+        if 2 * row < n+1:
+            return 2
+        return 1 if 2 * row == n+1 else 0
+    return symmetry
+
+
+# number of ways to place n queens, counted apart from the CSP engine,
+# which spends most of its time on dicts and domain lists. a column is
+# three ints: the rows taken, and the rows attacked along the diagonals
+# and the antidiagonals, shifted by one for every column further. like
+# queens_mirror, only the first queens in the upper half are tried and
+# what they find is counted twice
+def count_queens(n: int) -> int:
+    full: int = (1 << n)-1
+
+    def place(rows: int, down: int, up: int, left: int) -> int:
+        free: int = ~(rows | down | up) & full
+        if left == 1:
+            return bin(free).count("1")
+        total: int = 0
+        while free:
+            bit: int = free & -free
+            free ^= bit
+            if left == 2:  # the last queen can go on any row still free
+                total += bin(~(rows | bit | (down | bit) << 1 | (up | bit) >> 1) & full).count("1")
+            else:
+                total += place(rows | bit, (down | bit) << 1 & full, (up | bit) >> 1, left-1)
+        return total
+
+    if n == 1:
+        return 1
+    total: int = 0
+    for row in range(n // 2):
+        bit: int = 1 << row
+        total += 2 * place(bit, bit << 1 & full, bit >> 1, n-1)
+    if n % 2 == 1:
+        bit = 1 << n // 2
+        total += place(bit, bit << 1 & full, bit >> 1, n-1)
+    return total
+
 
 if __name__ == "__main__":
     columns: typing.List[int] = [1, 2, 3, 4, 5, 6, 7, 8]
@@ -34,3 +169,24 @@ if __name__ == "__main__":
         print("No solution found")
     else:
         print(solution)
+
+    # QueensConstraint.satisfied against the board itself: two queens
+    # attack each other on the same row or when the row and column
+    # distances match. its diagonal test used to compare a column with a
+    # row, which let attacking queens through
+    constraint: QueensConstraint = QueensConstraint(columns)
+    for c1 in columns:
+        for c2 in columns:
+            for r1 in columns:
+                for r2 in columns:
+                    if c1 != c2:
+                        attack: bool = r1 == r2 or abs(r1-r2) == abs(c1-c2)
+                        assert constraint.satisfied({c1: r1, c2: r2}) != attack
+    boards: typing.List[typing.Dict[int, int]] = list(csp.solutions())
+    for board in boards:
+        assert len(set(board.values())) == 8
+        assert len({row-column for column, row in board.items()}) == 8
+        assert len({row+column for column, row in board.items()}) == 8
+        assert constraint.satisfied(board)
+    assert len(boards) == 92
+    print(f"{len(boards)} solutions, every one a valid board")
@@ -1,8 +1,9 @@
 import typing
 import random
 import string
+import time
 
-from csp import CSP, Constraint
+from csp import CSP, Constraint, ConflictCounter, CSPStats
 
 Grid = typing.List[typing.List[str]]
 
@@ -21,6 +22,183 @@ def display_grid(grid: Grid) -> None:
         print(''.join(row))
 
 
+# right, down, down right, down left and the same four backwards
+DIRECTIONS: typing.List[typing.Tuple[int, int]] = [(0, 1), (1, 0), (1, 1), (1, -1),
+                                                   (0, -1), (-1, 0), (-1, -1), (-1, 1)]
+
+
+# every place a word of some length fits in a rows x columns grid. cell
+# (row, column) is bit row*columns+column of a bitset, and a placement is
+# an int: the cell of the first letter times 8 plus the direction. its
+# bitset is the pattern of the word's length and direction shifted to the
+# lowest of its cells, so nothing bigger than an int is kept per placement
+class Placements:
+    def __init__(self, rows: int, columns: int, seed: typing.Optional[int] = None) -> None:
+        self.rows: int = rows
+        self.columns: int = columns
+        self._choose: random.Random = random.Random(seed)
+        # per word length, shared by the words of that length
+        self._placements: typing.Dict[int, typing.List[int]] = {}
+        self._patterns: typing.Dict[int, typing.List[int]] = {}
+
+    # in random order, so a search taking the first one that fits spreads
+    # the words over the grid
+    def of_length(self, length: int) -> typing.List[int]:
+        if length not in self._placements:
+            placements: typing.List[int] = []
+            for direction, (dr, dc) in enumerate(DIRECTIONS):
+                last_row: int = (length-1) * dr
+                last_column: int = (length-1) * dc
+                for row in range(max(0, -last_row), min(self.rows, self.rows-last_row)):
+                    for column in range(max(0, -last_column), min(self.columns, self.columns-last_column)):
+                        placements.append((row * self.columns + column) * 8 + direction)
+            self._choose.shuffle(placements)
+            self._placements[length] = placements
+            self._patterns[length] = [sum(1 << i * abs(dr * self.columns + dc) for i in range(length))
+                                      for dr, dc in DIRECTIONS]
+        return self._placements[length]
+
+    def bits(self, length: int, placement: int) -> int:
+        start, direction = placement >> 3, placement & 7
+        dr, dc = DIRECTIONS[direction]
+        step: int = dr * self.columns + dc
+        lowest: int = start if step > 0 else start + (length-1) * step
+        return self._patterns[length][direction] << lowest
+
+    def locations(self, length: int, placement: int) -> typing.List[GridLocation]:
+        row, column = divmod(placement >> 3, self.columns)
+        dr, dc = DIRECTIONS[placement & 7]
+        return [GridLocation(row + i * dr, column + i * dc) for i in range(length)]
+
+
+# no two words share a cell, not even where their letters are the same,
+# which keeps every check a single AND of two bitsets
+class WordSearchConstraint(Constraint[str, int]):
+    def __init__(self, words: typing.List[str], placements: Placements) -> None:
+        super().__init__(words)
+        self.words: typing.List[str] = words
+        self.placements: Placements = placements
+        self._bits: typing.Dict[str, typing.Tuple[int, int]] = {}  # last placement of each word and its bits
+        # the words last seen placed, except the one being checked, and the
+        # cells they cover
+        self._placed: typing.Dict[str, int] = {}
+        self._occupied: int = 0
+
+    def _bits_of(self, word: str, placement: int) -> int:
+        cached: typing.Optional[typing.Tuple[int, int]] = self._bits.get(word)
+        if cached is None or cached[0] != placement:
+            cached = (placement, self.placements.bits(len(word), placement))
+            self._bits[word] = cached
+        return cached[1]
+
+    # the cells of every word in assignment but variable. backtracking adds
+    # or removes one word between checks, so the last cells are reused
+    # while the words behind them are still placed the same way, which a
+    # subset test of the dict views tells without a loop in python
+    def _occupied_by_others(self, variable: str, assignment: typing.Dict[str, int]) -> int:
+        placed: typing.Dict[str, int] = self._placed
+        if variable in placed or not placed.items() <= assignment.items():
+            placed.clear()
+            self._occupied = 0
+        if len(placed) + (variable in assignment) != len(assignment):
+            for word, placement in assignment.items():
+                if word != variable and word not in placed:
+                    placed[word] = placement
+                    self._occupied |= self._bits_of(word, placement)
+        return self._occupied
+
+    def satisfied(self, assignment: typing.Dict[str, int]) -> bool:
+        occupied: int = 0
+        for word, placement in assignment.items():
+            bits: int = self._bits_of(word, placement)
+            if occupied & bits:
+                return False
+            occupied |= bits
+        return True
+
+    def satisfied_with(self, variable: str, value: int, assignment: typing.Dict[str, int]) -> bool:
+        return not self._occupied_by_others(variable, assignment) & self.placements.bits(len(variable), value)
+
+    def remaining_values(self, variable: str, value: int, other: str, values: typing.List[int],
+                         assignment: typing.Dict[str, int]) -> typing.List[int]:
+        bits: int = self.placements.bits(len(variable), value)
+        length: int = len(other)
+        return [placement for placement in values if not self.placements.bits(length, placement) & bits]
+
+    def conflict_counter(self) -> "WordSearchCounter":
+        return WordSearchCounter(self)
+
+
+# for min_conflicts: every pair of overlapping words is a conflict
+class WordSearchCounter(ConflictCounter[str, int]):
+    def __init__(self, constraint: WordSearchConstraint) -> None:
+        super().__init__(constraint)
+        self.placements: Placements = constraint.placements
+
+    # words overlapping variable placed at value
+    def conflicting(self, variable: str, value: int, assignment: typing.Dict[str, int]) -> typing.List[str]:
+        bits: int = self.placements.bits(len(variable), value)
+        return [word for word, placement in assignment.items()
+                if word != variable and self.placements.bits(len(word), placement) & bits]
+
+    def conflicts(self, variable: str, value: int, assignment: typing.Dict[str, int]) -> int:
+        return len(self.conflicting(variable, value, assignment))
+
+
+# words to place as variables, longest first, and their placements as
+# domains. the words must be different
+def word_search_csp(words: typing.List[str], placements: Placements) -> CSP[str, int]:
+    ordered: typing.List[str] = sorted((word.upper() for word in words), key=len, reverse=True)
+    if len(set(ordered)) != len(ordered):
+        raise ValueError("every word should appear once")
+    csp: CSP[str, int] = CSP(ordered, {word: placements.of_length(len(word)) for word in ordered})
+    csp.add_constraint(WordSearchConstraint(ordered, placements))
+    return csp
+
+
+# a random grid with the words written into it and where each word is,
+# or None if they do not all fit
+def build_word_search(words: typing.List[str], rows: int, columns: int, seed: typing.Optional[int] = None,
+                      stats: typing.Optional[CSPStats] = None
+                      ) -> typing.Optional[typing.Tuple[Grid, typing.Dict[str, typing.List[GridLocation]]]]:
+    placements: Placements = Placements(rows, columns, seed)
+    csp: CSP[str, int] = word_search_csp(words, placements)
+    solution: typing.Optional[typing.Dict[str, int]] = csp.backtracking_search(stats=stats)
+    if solution is None:
+        return None
+    grid: Grid = generate_grid(rows, columns)
+    found: typing.Dict[str, typing.List[GridLocation]] = {}
+    for word, placement in solution.items():
+        found[word] = placements.locations(len(word), placement)
+        for letter, (row, column) in zip(word, found[word]):
+            grid[row][column] = letter
+    return grid, found
+
+
 if __name__ == '__main__':
     g: Grid = generate_grid(20, 20)
     display_grid(g)
+
+    result = build_word_search(["MATTHEW", "JOE", "MARY", "SARAH", "SALLY"], 9, 9, seed=1)
+    assert result is not None
+    print()
+    display_grid(result[0])
+    for word, locations in result[1].items():
+        print(word, locations[0], locations[-1])
+
+    choose: random.Random = random.Random(1)
+    for size, count in ((50, 100), (100, 300), (100, 600)):
+        words: typing.Set[str] = set()
+        while len(words) < count:
+            words.add(''.join(choose.choice(string.ascii_uppercase) for _ in range(choose.randint(3, 12))))
+        started: float = time.perf_counter()
+        placements: Placements = Placements(size, size, 1)
+        csp: CSP[str, int] = word_search_csp(sorted(words), placements)
+        indexed: float = time.perf_counter()-started
+        stats: CSPStats = CSPStats()
+        solution = csp.backtracking_search(stats=stats)
+        assert solution is not None and csp.constraints[csp.variables[0]][0].satisfied(solution)
+        filled: int = sum(len(word) for word in words)
+        print(f"{size}x{size} grid, {count} words ({filled / size**2:.0%} of the cells): "
+              f"placements indexed in {indexed:.2f}s, placed in {stats.total_time:.2f}s "
+              f"({stats.nodes} placements tried, {stats.backtracks} backtracks)")
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import typing
+from array import array
+from edge import Edge
+from weighted_edge import WeightedEdge
+
+V = typing.TypeVar('V')  # graph vertix type
+
+
+# read-only graph in compressed sparse row form:
+# neighbors of vertex i are _targets[_offsets[i]:_offsets[i+1]]
+# (and their weights are at the same positions of _weights)
+class CSRGraph(typing.Generic[V]):
+    def __init__(self, vertices: typing.Sequence[V],
+                 offsets: typing.Sequence[int],
+                 targets: typing.Sequence[int],
+                 weights: typing.Optional[typing.Sequence[float]] = None) -> None:
+        if len(offsets) != len(vertices)+1:
+            raise ValueError("offsets should have vertex_count+1 items")
+        if weights is not None and len(weights) != len(targets):
+            raise ValueError("weights and targets should have the same length")
+        self._vertices: typing.Sequence[V] = vertices
+        self._offsets: typing.Sequence[int] = offsets
+        self._targets: typing.Sequence[int] = targets
+        self._weights: typing.Optional[typing.Sequence[float]] = weights
+        self._indices: typing.Dict[V, int] = {
+            vertex: i for i, vertex in enumerate(vertices)}
+
+    # pack any graph with the Graph/WeightedGraph api into arrays, with
+    # weights when graph.weighted
+    @classmethod
+    def from_graph(cls, graph: typing.Any) -> CSRGraph[V]:
+        offsets: array = array('q', [0])
+        targets: array = array('q')
+        weights: typing.Optional[array] = array('d') if graph.weighted else None
+        for i in range(graph.vertex_count):
+            edges = graph.edges_for_index(i)
+            targets.extend(e.v for e in edges)
+            if weights is not None:
+                weights.extend(e.weight for e in edges)
+            offsets.append(len(targets))
+        vertices: typing.List[V] = [graph.vertex_at(i)
+                                    for i in range(graph.vertex_count)]
+        return cls(vertices, offsets, targets, weights)
+
+    # pack undirected edges given as parallel arrays of vertex indices
+    # (and weights), both directions of every edge are stored
+    @classmethod
+    def from_edge_arrays(cls, vertices: typing.Sequence[V],
+                         sources: typing.Sequence[int],
+                         targets: typing.Sequence[int],
+                         weights: typing.Optional[typing.Sequence[float]] = None) -> CSRGraph[V]:
+        # counting sort of both directions of every edge by source vertex
+        offsets: array = array('q', [0]) * (len(vertices)+1)
+        for u, v in zip(sources, targets):
+            offsets[u+1] += 1
+            offsets[v+1] += 1
+        for i in range(len(vertices)):
+            offsets[i+1] += offsets[i]
+        position: array = offsets[:-1]
+        csr_targets: array = array('q', [0]) * offsets[-1]
+        csr_weights: typing.Optional[array] = None
+        if weights is not None:
+            csr_weights = array('d', [0.0]) * offsets[-1]
+        for i in range(len(sources)):
+            u, v = sources[i], targets[i]
+            csr_targets[position[u]] = v
+            if csr_weights is not None:
+                csr_weights[position[u]] = weights[i]
+            position[u] += 1
+            csr_targets[position[v]] = u
+            if csr_weights is not None:
+                csr_weights[position[v]] = weights[i]
+            position[v] += 1
+        return cls(vertices, offsets, csr_targets, csr_weights)
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self._vertices)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._targets)
+
+    # csr graph is never modified
+    @property
+    def version(self) -> int:
+        return 0
+
+    @property
+    def weighted(self) -> bool:
+        return self._weights is not None
+
+    def vertex_at(self, index: int) -> V:
+        return self._vertices[index]
+
+    def index_of(self, vertex: V) -> int:
+        try:
+            return self._indices[vertex]
+        except KeyError:
+            raise ValueError(f"{vertex!r} is not in graph") from None
+
+    def __contains__(self, vertex: object) -> bool:
+        return vertex in self._indices
+
+    # raw neighbor indices, cheapest way to walk the graph
+    def neighbor_indices(self, index: int) -> typing.Sequence[int]:
+        return self._targets[self._offsets[index]:self._offsets[index+1]]
+
+    def neighbors_for_index(self, index: int) -> typing.List[V]:
+        vertices: typing.Sequence[V] = self._vertices
+        return [vertices[t] for t in self.neighbor_indices(index)]
+
+    def neighbors_for_vertex(self, vertex: V) -> typing.List[V]:
+        return self.neighbors_for_index(self.index_of(vertex))
+
+    # edges are not stored, they are created on demand
+    def edges_for_index(self, index: int) -> typing.List[Edge]:
+        start: int = self._offsets[index]
+        end: int = self._offsets[index+1]
+        if self._weights is None:
+            return [Edge(index, self._targets[i]) for i in range(start, end)]
+        return [WeightedEdge(index, self._targets[i], self._weights[i])
+                for i in range(start, end)]
+
+    def edges_for_vertex(self, vertex: V) -> typing.List[Edge]:
+        return self.edges_for_index(self.index_of(vertex))
+
+    def neighbors_for_index_with_weights(self, index: int) -> typing.List[typing.Tuple[V, float]]:
+        if self._weights is None:
+            raise TypeError("graph has no weights")
+        start: int = self._offsets[index]
+        end: int = self._offsets[index+1]
+        return [(self._vertices[self._targets[i]], self._weights[i])
+                for i in range(start, end)]
+
+    def neighbors_for_vertex_with_weights(self, vertex: V) -> typing.List[typing.Tuple[V, float]]:
+        return self.neighbors_for_index_with_weights(self.index_of(vertex))
+
+    def __str__(self) -> str:
+        desc: str = ""
+        for i in range(self.vertex_count):
+            if self._weights is None:
+                desc += f"{self.vertex_at(i)}->{self.neighbors_for_index(i)}\n"
+            else:
+                desc += f"{self.vertex_at(i)} -> {self.neighbors_for_index_with_weights(i)}\n"
+        return desc
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    import tracemalloc
+    import sys
+    sys.path.insert(0, '..')
+    from ch2.generic_search import bfs
+    from weighted_graph import WeightedGraph
+
+    def traverse(graph: typing.Any) -> int:
+        # plain index based bfs over the whole graph
+        seen: bytearray = bytearray(graph.vertex_count)
+        seen[0] = 1
+        queue: typing.List[int] = [0]
+        for u in queue:
+            for v in graph.neighbor_indices(u):
+                if not seen[v]:
+                    seen[v] = 1
+                    queue.append(v)
+        return len(queue)
+
+    n: int = 100_000
+    m: int = 500_000
+    random.seed(1)
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    graph: WeightedGraph[int] = WeightedGraph(list(range(n)))
+    for _ in range(m):
+        graph.add_edge_by_indices(random.randrange(
+            n), random.randrange(n), random.uniform(1.0, 100.0))
+    lists_size: int = tracemalloc.get_traced_memory()[0]-before
+    before = tracemalloc.get_traced_memory()[0]
+    compact: CSRGraph[int] = graph.compact()
+    csr_size: int = tracemalloc.get_traced_memory()[0]-before
+    tracemalloc.stop()
+    print(f"{n} vertices, {m} edges")
+    print(f"list of lists: {lists_size / 2**20:.1f} MiB "
+          f"({lists_size / graph.edge_count:.0f} bytes per half-edge)")
+    print(f"csr:           {csr_size / 2**20:.1f} MiB "
+          f"({csr_size / compact.edge_count:.0f} bytes per half-edge)")
+
+    for name, g in (("list of lists", graph), ("csr", compact)):
+        start: float = time.perf_counter()
+        reached: int = traverse(g)
+        index_time: float = time.perf_counter()-start
+        start = time.perf_counter()
+        # vertices are 0..n-1, so they double as indices here
+        bfs(0, lambda x: False, g.neighbors_for_index)
+        generic_time: float = time.perf_counter()-start
+        print(f"{name}: index bfs {index_time:.2f}s, "
+              f"generic bfs {generic_time:.2f}s, reached {reached}")
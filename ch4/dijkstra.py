@@ -0,0 +1,155 @@
+from __future__ import annotations
+import typing
+import heapq
+from collections import OrderedDict
+from weighted_graph import WeightedGraph
+from weighted_edge import WeightedEdge
+
+V = typing.TypeVar('V')  # vertices type in graph
+WeightedPath = typing.List[WeightedEdge]
+# distance to every vertex index (None if unreachable) and the edge
+# used to reach every vertex index
+ShortestPathTree = typing.Tuple[typing.List[typing.Optional[float]],
+                                typing.Dict[int, WeightedEdge]]
+
+
+def dijkstra(wg: WeightedGraph[V], root: V) -> ShortestPathTree:
+    first: int = wg.index_of(root)
+    distances: typing.List[typing.Optional[float]] = [None] * wg.vertex_count
+    distances[first] = 0
+    path_dict: typing.Dict[int, WeightedEdge] = {}
+    # (distance, vertex index), stale entries are skipped when popped
+    pq: typing.List[typing.Tuple[float, int]] = [(0, first)]
+    while pq:
+        dist_u, u = heapq.heappop(pq)
+        if dist_u > distances[u]:
+            continue
+        for we in wg.edges_for_index(u):
+            dist_v: typing.Optional[float] = distances[we.v]
+            new_dist: float = dist_u + we.weight
+            if dist_v is None or dist_v > new_dist:
+                distances[we.v] = new_dist
+                path_dict[we.v] = we
+                heapq.heappush(pq, (new_dist, we.v))
+    return distances, path_dict
+
+
+def distance_array_to_vertex_dict(wg: WeightedGraph[V], distances: typing.List[typing.Optional[float]]
+                                  ) -> typing.Dict[V, typing.Optional[float]]:
+    distance_dict: typing.Dict[V, typing.Optional[float]] = {}
+    for i in range(len(distances)):
+        distance_dict[wg.vertex_at(i)] = distances[i]
+    return distance_dict
+
+
+def path_dict_to_path(start: int, end: int,
+                      path_dict: typing.Dict[int, WeightedEdge]) -> WeightedPath:
+    if len(path_dict) == 0 or end not in path_dict:
+        return []
+    edge_path: WeightedPath = []
+    e: WeightedEdge = path_dict[end]
+    edge_path.append(e)
+    while e.u != start:
+        e = path_dict[e.u]
+        edge_path.append(e)
+    edge_path.reverse()
+    return edge_path
+
+
+def total_weight(wp: WeightedPath) -> float:
+    return sum(e.weight for e in wp)
+
+
+# LRU cache of shortest path trees keyed by source vertex,
+# emptied as soon as the graph is changed
+class ShortestPathCache(typing.Generic[V]):
+    def __init__(self, wg: WeightedGraph[V], maxsize: int = 32) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize should be positive")
+        self._wg: WeightedGraph[V] = wg
+        self._maxsize: int = maxsize
+        self._trees: OrderedDict[int, ShortestPathTree] = OrderedDict()
+        self._version: int = wg.version
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def clear(self) -> None:
+        self._trees.clear()
+
+    def shortest_path_tree(self, root: V) -> ShortestPathTree:
+        if self._wg.version != self._version:
+            self._trees.clear()
+            self._version = self._wg.version
+        first: int = self._wg.index_of(root)
+        tree: typing.Optional[ShortestPathTree] = self._trees.get(first)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(first)
+            return tree
+        self.misses += 1
+        tree = dijkstra(self._wg, root)
+        self._trees[first] = tree
+        if len(self._trees) > self._maxsize:
+            self._trees.popitem(last=False)
+        return tree
+
+    def distance(self, start: V, end: V) -> typing.Optional[float]:
+        distances, _ = self.shortest_path_tree(start)
+        return distances[self._wg.index_of(end)]
+
+    def path(self, start: V, end: V) -> WeightedPath:
+        _, path_dict = self.shortest_path_tree(start)
+        return path_dict_to_path(self._wg.index_of(start),
+                                 self._wg.index_of(end), path_dict)
+
+
+if __name__ == "__main__":
+    from weighted_graph import city_graph
+
+    city_graph2: WeightedGraph[str] = city_graph()
+
+    distances, path_dict = dijkstra(city_graph2, "Los Angeles")
+    name_distance: typing.Dict[str, typing.Optional[float]] = distance_array_to_vertex_dict(
+        city_graph2, distances)
+    print("Distances from Los Angeles:")
+    for key, value in name_distance.items():
+        print(f"{key} : {value}")
+    print("")
+
+    print("Shortest path from Los Angeles to Boston:")
+    path: WeightedPath = path_dict_to_path(city_graph2.index_of(
+        "Los Angeles"), city_graph2.index_of("Boston"), path_dict)
+    for edge in path:
+        print(f"{city_graph2.vertex_at(edge.u)} {edge.weight}> {city_graph2.vertex_at(edge.v)}")
+    print(f"Total weight: {total_weight(path)}\n")
+
+    # repeated queries from a few hubs only run dijkstra once per hub
+    import random
+    import time
+    n: int = 50_000
+    random.seed(1)
+    big: WeightedGraph[int] = WeightedGraph(list(range(n)))
+    for _ in range(4 * n):
+        big.add_edge_by_indices(random.randrange(n), random.randrange(n),
+                                random.uniform(1.0, 100.0))
+    cache: ShortestPathCache[int] = ShortestPathCache(big, maxsize=8)
+    hubs: typing.List[int] = random.sample(range(n), 4)
+    queries: typing.List[typing.Tuple[int, int]] = [
+        (random.choice(hubs), random.randrange(n)) for _ in range(1000)]
+    start: float = time.perf_counter()
+    for source, target in queries[:20]:
+        dijkstra(big, source)
+    uncached: float = (time.perf_counter()-start) / 20
+    start = time.perf_counter()
+    for source, target in queries:
+        cache.distance(source, target)
+    cached: float = (time.perf_counter()-start) / len(queries)
+    print(f"{n} vertices: {uncached * 1000:.2f} ms per query without cache, "
+          f"{cached * 1000:.3f} ms with cache "
+          f"({cache.hits} hits, {cache.misses} misses)")
+    big.add_edge_by_indices(hubs[0], hubs[1], 1.0)
+    cache.distance(hubs[0], hubs[1])
+    print(f"after add_edge: {len(cache)} tree(s) cached, {cache.misses} misses")
@@ -1,5 +1,6 @@
 
 from edge import Edge
+from csr_graph import CSRGraph
 import typing
 
 import sys
@@ -9,9 +10,13 @@ V = typing.TypeVar('V')  # graph vertix type
 
 
 class Graph(typing.Generic[V]):
-    def __init__(self, verticles: typing.List[V] = []) -> None:
-        self._vertices: typing.List[V] = verticles
-        self._edges: typing.List[typing.List[Edge]] = [[]for _ in verticles]
+    def __init__(self, verticles: typing.Optional[typing.List[V]] = None) -> None:
+        self._vertices: typing.List[V] = []
+        self._edges: typing.List[typing.List[Edge]] = []
+        self._indices: typing.Dict[V, int] = {}  # vertex -> index
+        self._version: int = 0  # bumped on every change of the graph
+        for vertex in verticles or []:
+            self.add_vertex(vertex)
 
     @property
     def vertex_count(self) -> int:
@@ -21,33 +26,67 @@ class Graph(typing.Generic[V]):
     def edge_count(self) -> int:
         return sum(map(len, self._edges))
 
+    # whether edges carry weights, WeightedGraph says yes even without edges
+    @property
+    def weighted(self) -> bool:
+        return False
+
+    # lets caches built on top of the graph notice that it changed
+    @property
+    def version(self) -> int:
+        return self._version
+
     # add vertex to graph, return index
+    # vertices are unique, adding the same vertex twice is an error
     def add_vertex(self, vertex: V) -> int:
+        if vertex in self._indices:
+            raise ValueError(f"{vertex!r} is already in graph")
+        self._indices[vertex] = len(self._vertices)
         self._vertices.append(vertex)
         self._edges.append([])
+        self._version += 1
         return self.vertex_count-1
 
     # unordered graph, so we add verticles in both directions
     def add_edge(self, edge: Edge) -> None:
         self._edges[edge.u].append(edge)
         self._edges[edge.v].append(edge.reversed())
+        self._version += 1
 
     def add_edge_by_indices(self, u: int, v: int) -> None:
         edge: Edge = Edge(u, v)
         self.add_edge(edge)
 
     def add_edge_by_vertices(self, first: V, second: V) -> None:
-        u: int = self._vertices.index(first)
-        v: int = self._vertices.index(second)
+        u: int = self.index_of(first)
+        v: int = self.index_of(second)
         self.add_edge_by_indices(u, v)
 
+    # bulk load of (first, second) pairs, one hash lookup per vertex
+    def add_edges_by_vertices(self, edges: typing.Iterable[typing.Tuple[V, V]]) -> None:
+        indices: typing.Dict[V, int] = self._indices
+        try:
+            for first, second in edges:
+                self.add_edge_by_indices(indices[first], indices[second])
+        except KeyError as e:
+            raise ValueError(f"{e.args[0]!r} is not in graph") from None
+
     # serach vertex by index
     def vertex_at(self, index: int) -> V:
         return self._vertices[index]
 
-    # search vertex index by index
+    # search vertex index by vertex
     def index_of(self, vertex: V) -> int:
-        return self._vertices.index(vertex)
+        try:
+            return self._indices[vertex]
+        except KeyError:
+            raise ValueError(f"{vertex!r} is not in graph") from None
+
+    def __contains__(self, vertex: object) -> bool:
+        return vertex in self._indices
+
+    def neighbor_indices(self, index: int) -> typing.List[int]:
+        return [e.v for e in self._edges[index]]
 
     def neighbors_for_index(self, index: int) -> typing.List[V]:
         return list(map(self.vertex_at, [e.v for e in self._edges[index]]))
@@ -61,6 +100,10 @@ class Graph(typing.Generic[V]):
     def edges_for_vertex(self, vertex: V) -> typing.List[Edge]:
         return self.edges_for_index(self.index_of(vertex))
 
+    # frozen copy of the graph in compressed sparse row form
+    def compact(self) -> CSRGraph[V]:
+        return CSRGraph.from_graph(self)
+
     def __str__(self) -> str:
         desc: str = ""
         for i in range(self.vertex_count):
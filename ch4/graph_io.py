@@ -0,0 +1,181 @@
+from __future__ import annotations
+import typing
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from graph import Graph
+from weighted_graph import WeightedGraph
+from csr_graph import CSRGraph
+
+# snapshot layout (native byte order, every section 8-byte aligned):
+# header | pickled vertex list | offsets int64 | targets int64 | weights float64
+SNAPSHOT_MAGIC: bytes = b"CSRG"
+SNAPSHOT_VERSION: int = 1
+_HEADER: struct.Struct = struct.Struct("<4sHBBqqq")
+_LITTLE, _WEIGHTED = 1, 2  # flags
+
+
+# yields (u, v) or (u, v, weight) tuples from a text edge list,
+# reading chunk_size bytes worth of lines at a time;
+# empty lines and lines starting with # are skipped
+def read_edge_list(path: str, weighted: bool = False,
+                   chunk_size: int = 1 << 20) -> typing.Iterator[typing.Tuple]:
+    with open(path, encoding="utf-8") as f:
+        line_number: int = 0
+        while True:
+            lines: typing.List[str] = f.readlines(chunk_size)
+            if not lines:
+                return
+            for line in lines:
+                line_number += 1
+                fields: typing.List[str] = line.split()
+                if not fields or fields[0].startswith("#"):
+                    continue
+                if weighted:
+                    if len(fields) != 3:
+                        raise ValueError(
+                            f"{path}:{line_number}: expected 'u v weight'")
+                    yield fields[0], fields[1], float(fields[2])
+                else:
+                    if len(fields) != 2:
+                        raise ValueError(f"{path}:{line_number}: expected 'u v'")
+                    yield fields[0], fields[1]
+
+
+# builds a graph from a text edge list, vertices are the names from the file
+# in order of first appearance
+def load_edge_list(path: str, weighted: bool = False,
+                   chunk_size: int = 1 << 20) -> Graph[str]:
+    graph: Graph[str] = WeightedGraph() if weighted else Graph()
+
+    def index(vertex: str) -> int:
+        if vertex in graph:
+            return graph.index_of(vertex)
+        return graph.add_vertex(vertex)
+
+    for edge in read_edge_list(path, weighted, chunk_size):
+        if weighted:
+            graph.add_edge_by_indices(index(edge[0]), index(edge[1]), edge[2])
+        else:
+            graph.add_edge_by_indices(index(edge[0]), index(edge[1]))
+    return graph
+
+
+# same as load_edge_list, but edges go straight into flat arrays and are
+# packed into a csr graph, no Edge objects are created on the way
+def load_edge_list_compact(path: str, weighted: bool = False,
+                           chunk_size: int = 1 << 20) -> CSRGraph[str]:
+    vertices: typing.List[str] = []
+    index_of: typing.Dict[str, int] = {}
+    sources: array = array('q')
+    targets: array = array('q')
+    weights: array = array('d')
+    for edge in read_edge_list(path, weighted, chunk_size):
+        for vertex in edge[:2]:
+            if vertex not in index_of:
+                index_of[vertex] = len(vertices)
+                vertices.append(vertex)
+        sources.append(index_of[edge[0]])
+        targets.append(index_of[edge[1]])
+        if weighted:
+            weights.append(edge[2])
+    return CSRGraph.from_edge_arrays(vertices, sources, targets,
+                                     weights if weighted else None)
+
+
+def _as_array(typecode: str, values: typing.Sequence) -> array:
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+def save_snapshot(graph: typing.Any, path: str) -> None:
+    csr: CSRGraph = graph if isinstance(graph, CSRGraph) else graph.compact()
+    offsets: array = _as_array('q', csr._offsets)
+    targets: array = _as_array('q', csr._targets)
+    weights: typing.Optional[array] = None if csr._weights is None else _as_array(
+        'd', csr._weights)
+    vertices: bytes = pickle.dumps(list(csr._vertices),
+                                   protocol=pickle.HIGHEST_PROTOCOL)
+    flags: int = (_LITTLE if sys.byteorder == "little" else 0) | (
+        _WEIGHTED if weights is not None else 0)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, 0,
+                             csr.vertex_count, csr.edge_count, len(vertices)))
+        f.write(vertices)
+        f.write(bytes(-(_HEADER.size+len(vertices)) % 8))
+        offsets.tofile(f)
+        targets.tofile(f)
+        if weights is not None:
+            weights.tofile(f)
+
+
+# maps the snapshot and returns a csr graph whose arrays are views onto
+# the mapping, nothing but the vertex list is copied into memory.
+# the vertex list is pickled, so only load snapshots you trust
+def load_snapshot(path: str) -> CSRGraph:
+    with open(path, "rb") as f:
+        mapping: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, flags, _, vertex_count, edge_count, vertices_size = _HEADER.unpack_from(
+        mapping)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is not a graph snapshot")
+    if bool(flags & _LITTLE) != (sys.byteorder == "little"):
+        raise ValueError(f"{path} was written with another byte order")
+    position: int = _HEADER.size
+    vertices: typing.List = pickle.loads(
+        mapping[position:position+vertices_size])
+    position += vertices_size
+    position += -position % 8
+    view: memoryview = memoryview(mapping)
+    offsets: memoryview = view[position:position +
+                               8*(vertex_count+1)].cast('q')
+    position += 8*(vertex_count+1)
+    targets: memoryview = view[position:position+8*edge_count].cast('q')
+    position += 8*edge_count
+    weights: typing.Optional[memoryview] = None
+    if flags & _WEIGHTED:
+        weights = view[position:position+8*edge_count].cast('d')
+    return CSRGraph(vertices, offsets, targets, weights)
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+
+    n: int = 100_000
+    m: int = 1_000_000
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as directory:
+        text_path: str = os.path.join(directory, "edges.txt")
+        snapshot_path: str = os.path.join(directory, "edges.csrg")
+        with open(text_path, "w") as f:
+            for _ in range(m):
+                f.write(f"v{random.randrange(n)} v{random.randrange(n)} "
+                        f"{random.uniform(1.0, 100.0):.2f}\n")
+
+        start: float = time.perf_counter()
+        graph: Graph[str] = load_edge_list(text_path, weighted=True)
+        print(f"text edge list: {graph.vertex_count} vertices, "
+              f"{graph.edge_count // 2} edges loaded in {time.perf_counter()-start:.2f}s")
+        start = time.perf_counter()
+        save_snapshot(graph, snapshot_path)
+        print(f"snapshot of {os.path.getsize(snapshot_path) / 2**20:.1f} MiB "
+              f"written in {time.perf_counter()-start:.2f}s")
+        start = time.perf_counter()
+        snapshot: CSRGraph = load_snapshot(snapshot_path)
+        print(f"snapshot loaded in {time.perf_counter()-start:.2f}s")
+        start = time.perf_counter()
+        compact: CSRGraph[str] = load_edge_list_compact(
+            text_path, weighted=True)
+        print(f"text edge list straight to csr in {time.perf_counter()-start:.2f}s")
+        vertex: str = graph.vertex_at(0)
+        for g in (compact, snapshot):
+            assert graph.neighbors_for_index_with_weights(0) == \
+                g.neighbors_for_index_with_weights(g.index_of(vertex))
+        print(f"{vertex} -> {snapshot.neighbors_for_vertex(vertex)}")
+        del snapshot
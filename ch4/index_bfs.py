@@ -0,0 +1,158 @@
+from __future__ import annotations
+import typing
+from array import array
+
+# searches in this module work on vertex indices only and take any graph
+# with neighbor_indices() (Graph, WeightedGraph or CSRGraph)
+
+
+# hop distance from the nearest seed to every vertex index, -1 if unreachable
+def multi_source_bfs(graph: typing.Any, seeds: typing.Iterable[int],
+                     max_distance: typing.Optional[int] = None) -> array:
+    distances: array = array('l', [-1]) * graph.vertex_count
+    frontier: typing.List[int] = []
+    for seed in seeds:
+        if distances[seed] == -1:
+            distances[seed] = 0
+            frontier.append(seed)
+    neighbors = graph.neighbor_indices
+    distance: int = 0
+    while frontier and (max_distance is None or distance < max_distance):
+        distance += 1
+        next_frontier: typing.List[int] = []
+        for u in frontier:
+            for v in neighbors(u):
+                if distances[v] == -1:
+                    distances[v] = distance
+                    next_frontier.append(v)
+        frontier = next_frontier
+    return distances
+
+
+# answers many point to point queries on one graph; the per vertex buffers
+# are allocated once and a vertex counts as visited only if its stamp equals
+# the current query number, so nothing is cleared between queries
+class BatchBFS:
+    def __init__(self, graph: typing.Any) -> None:
+        self._graph: typing.Any = graph
+        n: int = graph.vertex_count
+        # index 0 is the forward search, index 1 the backward one
+        self._stamps: typing.Tuple[array, array] = (
+            array('l', [0]) * n, array('l', [0]) * n)
+        self._distances: typing.Tuple[array, array] = (
+            array('l', [0]) * n, array('l', [0]) * n)
+        self._parents: typing.Tuple[array, array] = (
+            array('l', [0]) * n, array('l', [0]) * n)
+        self._query: int = 0
+
+    # bidirectional bfs, returns the vertex where both searches met on a
+    # shortest path, or None if target is unreachable
+    def _meet(self, source: int, target: int) -> typing.Optional[int]:
+        self._query += 1
+        query: int = self._query
+        stamps, distances, parents = self._stamps, self._distances, self._parents
+        for side, root in ((0, source), (1, target)):
+            stamps[side][root] = query
+            distances[side][root] = 0
+            parents[side][root] = -1
+        if source == target:
+            return source
+        neighbors = self._graph.neighbor_indices
+        frontiers: typing.List[typing.List[int]] = [[source], [target]]
+        while frontiers[0] and frontiers[1]:
+            # grow the smaller frontier by one whole level
+            side: int = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            stamp, distance, parent = stamps[side], distances[side], parents[side]
+            other_stamp, other_distance = stamps[1-side], distances[1-side]
+            best: typing.Optional[int] = None
+            best_length: int = 0
+            next_frontier: typing.List[int] = []
+            for u in frontiers[side]:
+                du: int = distance[u]+1
+                for v in neighbors(u):
+                    if stamp[v] == query:
+                        continue
+                    stamp[v] = query
+                    distance[v] = du
+                    parent[v] = u
+                    next_frontier.append(v)
+                    if other_stamp[v] == query and (best is None or du+other_distance[v] < best_length):
+                        best = v
+                        best_length = du+other_distance[v]
+            if best is not None:
+                return best
+            frontiers[side] = next_frontier
+        return None
+
+    def distance(self, source: int, target: int) -> typing.Optional[int]:
+        meet: typing.Optional[int] = self._meet(source, target)
+        if meet is None:
+            return None
+        return self._distances[0][meet]+self._distances[1][meet]
+
+    # shortest path as a list of vertex indices from source to target
+    def path(self, source: int, target: int) -> typing.Optional[typing.List[int]]:
+        meet: typing.Optional[int] = self._meet(source, target)
+        if meet is None:
+            return None
+        path: typing.List[int] = []
+        v: int = meet
+        while v != -1:
+            path.append(v)
+            v = self._parents[0][v]
+        path.reverse()
+        v = self._parents[1][meet]
+        while v != -1:
+            path.append(v)
+            v = self._parents[1][v]
+        return path
+
+    def distances(self, pairs: typing.Iterable[typing.Tuple[int, int]]) -> typing.List[typing.Optional[int]]:
+        return [self.distance(source, target) for source, target in pairs]
+
+    def paths(self, pairs: typing.Iterable[typing.Tuple[int, int]]) -> typing.List[typing.Optional[typing.List[int]]]:
+        return [self.path(source, target) for source, target in pairs]
+
+
+def bidirectional_bfs(graph: typing.Any, source: int, target: int) -> typing.Optional[typing.List[int]]:
+    return BatchBFS(graph).path(source, target)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    import sys
+    sys.path.insert(0, '..')
+    from ch2.generic_search import bfs, node_to_path
+    from csr_graph import CSRGraph
+
+    n: int = 1_000_000
+    m: int = 2_000_000
+    random.seed(1)
+    graph: CSRGraph[int] = CSRGraph.from_edge_arrays(
+        range(n), array('q', (random.randrange(n) for _ in range(m))),
+        array('q', (random.randrange(n) for _ in range(m))))
+    pairs: typing.List[typing.Tuple[int, int]] = [
+        (random.randrange(n), random.randrange(n)) for _ in range(1000)]
+
+    start: float = time.perf_counter()
+    for source, target in pairs[:5]:
+        # vertices are 0..n-1, so they double as indices here
+        node = bfs(source, lambda x: x == target, graph.neighbors_for_index)
+        assert node is not None and len(node_to_path(node)) == \
+            len(bidirectional_bfs(graph, source, target))
+    generic_time: float = (time.perf_counter()-start) / 5
+
+    batch: BatchBFS = BatchBFS(graph)
+    start = time.perf_counter()
+    batch.distances(pairs)
+    batch_time: float = (time.perf_counter()-start) / len(pairs)
+    print(f"{n} vertices, {m} edges")
+    print(f"generic bfs:       {generic_time * 1000:.1f} ms per query")
+    print(f"bidirectional bfs: {batch_time * 1000:.2f} ms per query "
+          f"({len(pairs)} queries)")
+
+    start = time.perf_counter()
+    hops: array = multi_source_bfs(graph, range(0, n, n // 100))
+    print(f"multi source bfs from 100 seeds: {time.perf_counter()-start:.2f}s, "
+          f"max distance {max(hops)}")
@@ -0,0 +1,209 @@
+from __future__ import annotations
+import typing
+import heapq
+import math
+import random
+import struct
+from array import array
+from weighted_graph import WeightedGraph
+from dijkstra import dijkstra
+
+V = typing.TypeVar('V')  # vertices type in graph
+
+_HEADER: struct.Struct = struct.Struct("<4sHqq")
+_MAGIC: bytes = b"ALTI"
+_VERSION: int = 1
+
+
+# ALT (A*, landmarks, triangle inequality) preprocessing: exact distances
+# from k landmark vertices give the lower bound
+#   d(u, t) >= |d(L, t) - d(L, u)|
+# for every landmark L, which is an admissible heuristic for a* on an
+# undirected graph with non negative weights
+class LandmarkIndex:
+    def __init__(self, landmarks: typing.Sequence[int],
+                 distances: typing.Sequence[array]) -> None:
+        if len(landmarks) != len(distances):
+            raise ValueError("one distance array per landmark is needed")
+        self.landmarks: typing.List[int] = list(landmarks)
+        # distances[i][v] is the distance from landmarks[i] to v, inf if unreachable
+        self._distances: typing.List[array] = list(distances)
+
+    # picks k landmarks by farthest selection: every next landmark is the
+    # vertex farthest away from all landmarks chosen so far
+    @classmethod
+    def build(cls, wg: WeightedGraph[V], k: int,
+              seed: typing.Optional[int] = None) -> LandmarkIndex:
+        if k < 1 or k > wg.vertex_count:
+            raise ValueError("k should be between 1 and vertex_count")
+        landmarks: typing.List[int] = []
+        distances: typing.List[array] = []
+        closest: array = array('d', [math.inf]) * wg.vertex_count
+        landmark: int = random.Random(seed).randrange(wg.vertex_count)
+        for _ in range(k):
+            found, _ = dijkstra(wg, wg.vertex_at(landmark))
+            row: array = array('d', (math.inf if d is None else d for d in found))
+            landmarks.append(landmark)
+            distances.append(row)
+            best: float = -1.0
+            for v in range(wg.vertex_count):
+                if row[v] < closest[v]:
+                    closest[v] = row[v]
+                # unreachable vertices do not count, they are another component
+                if closest[v] != math.inf and closest[v] > best:
+                    best = closest[v]
+                    landmark = v
+        return cls(landmarks, distances)
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self._distances[0])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(row.itemsize * len(row) for row in self._distances)
+
+    # lower bound of the distance between vertex indices u and t
+    def bound(self, u: int, t: int) -> float:
+        best: float = 0.0
+        for row in self._distances:
+            du: float = row[u]
+            dt: float = row[t]
+            if du == math.inf or dt == math.inf:
+                continue
+            if du - dt > best:
+                best = du - dt
+            elif dt - du > best:
+                best = dt - du
+        return best
+
+    def index_heuristic(self, target: int) -> typing.Callable[[int], float]:
+        def heuristic(u: int) -> float:
+            return self.bound(u, target)
+        return heuristic
+
+    # heuristic over vertices for ch2.generic_search style searches
+    def heuristic(self, wg: WeightedGraph[V], goal: V) -> typing.Callable[[V], float]:
+        target: int = wg.index_of(goal)
+
+        def heuristic(vertex: V) -> float:
+            return self.bound(wg.index_of(vertex), target)
+        return heuristic
+
+    def to_bytes(self) -> bytes:
+        return b"".join([_HEADER.pack(_MAGIC, _VERSION, len(self.landmarks), self.vertex_count),
+                         array('q', self.landmarks).tobytes()] +
+                        [row.tobytes() for row in self._distances])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> LandmarkIndex:
+        magic, version, k, n = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a landmark index")
+        position: int = _HEADER.size
+        landmarks: array = array('q')
+        landmarks.frombytes(data[position:position+8*k])
+        position += 8*k
+        distances: typing.List[array] = []
+        for _ in range(k):
+            row: array = array('d')
+            row.frombytes(data[position:position+8*n])
+            distances.append(row)
+            position += 8*n
+        return cls(landmarks, distances)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> LandmarkIndex:
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+# a* over vertex indices, returns distance, path of indices and number of
+# expanded vertices; with heuristic 0 this is plain dijkstra
+def alt_search(wg: WeightedGraph[V], source: int, target: int,
+               heuristic: typing.Callable[[int], float] = lambda _: 0.0
+               ) -> typing.Tuple[typing.Optional[float], typing.List[int], int]:
+    best: typing.Dict[int, float] = {source: 0.0}
+    parent: typing.Dict[int, int] = {source: -1}
+    closed: typing.Set[int] = set()
+    pq: typing.List[typing.Tuple[float, float, int]] = [
+        (heuristic(source), 0.0, source)]
+    while pq:
+        _, cost, u = heapq.heappop(pq)
+        if u in closed:
+            continue
+        closed.add(u)
+        if u == target:
+            path: typing.List[int] = []
+            while u != -1:
+                path.append(u)
+                u = parent[u]
+            path.reverse()
+            return cost, path, len(closed)
+        for we in wg.edges_for_index(u):
+            new_cost: float = cost + we.weight
+            if we.v not in best or new_cost < best[we.v]:
+                best[we.v] = new_cost
+                parent[we.v] = u
+                heapq.heappush(pq, (new_cost + heuristic(we.v), new_cost, we.v))
+    return None, [], len(closed)
+
+
+if __name__ == "__main__":
+    import time
+
+    # grid like road network with random lengths
+    side: int = 150
+    random.seed(1)
+    wg: WeightedGraph[typing.Tuple[int, int]] = WeightedGraph(
+        [(r, c) for r in range(side) for c in range(side)])
+    for r in range(side):
+        for c in range(side):
+            if c+1 < side:
+                wg.add_edge_by_indices(r*side+c, r*side+c+1, random.uniform(1.0, 3.0))
+            if r+1 < side:
+                wg.add_edge_by_indices(r*side+c, (r+1)*side+c, random.uniform(1.0, 3.0))
+    queries: typing.List[typing.Tuple[int, int]] = [
+        (random.randrange(wg.vertex_count), random.randrange(wg.vertex_count)) for _ in range(100)]
+
+    start: float = time.perf_counter()
+    expanded: int = 0
+    exact: typing.List[typing.Optional[float]] = []
+    for source, target in queries:
+        distance, _, count = alt_search(wg, source, target)
+        exact.append(distance)
+        expanded += count
+    print(f"dijkstra:    {expanded / len(queries):.0f} vertices expanded, "
+          f"{(time.perf_counter()-start) / len(queries) * 1000:.1f} ms per query")
+
+    for k in (2, 4, 8, 16):
+        start = time.perf_counter()
+        index: LandmarkIndex = LandmarkIndex.build(wg, k, seed=1)
+        build_time: float = time.perf_counter()-start
+        # what a worker process would do with an index built offline
+        index = LandmarkIndex.from_bytes(index.to_bytes())
+        start = time.perf_counter()
+        expanded = 0
+        for (source, target), expected in zip(queries, exact):
+            distance, _, count = alt_search(wg, source, target,
+                                            index.index_heuristic(target))
+            assert math.isclose(distance, expected)
+            expanded += count
+        print(f"alt, k={k:2}: {expanded / len(queries):.0f} vertices expanded, "
+              f"{(time.perf_counter()-start) / len(queries) * 1000:.1f} ms per query, "
+              f"preprocessing {build_time:.2f}s and {index.nbytes / 2**10:.0f} KiB")
+
+    # the same heuristic over vertices drives the generic weighted a*
+    import sys
+    sys.path.insert(0, '..')
+    from ch2.generic_search import weighted_astar
+    source_vertex, target_vertex = wg.vertex_at(queries[0][0]), wg.vertex_at(queries[0][1])
+    node = weighted_astar(source_vertex, lambda v: v == target_vertex,
+                          wg.neighbors_for_vertex_with_weights,
+                          index.heuristic(wg, target_vertex))
+    assert node is not None and math.isclose(node.cost, exact[0])
+    print(f"weighted_astar from {source_vertex} to {target_vertex}: {node.cost:.2f}")
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import typing
+import heapq
+from array import array
+from operator import attrgetter
+from weighted_graph import WeightedGraph
+from weighted_edge import WeightedEdge
+from dijkstra import WeightedPath, total_weight
+
+V = typing.TypeVar('V')  # vertices type in graph
+# edges of the tree and their total weight
+MSTResult = typing.Tuple[WeightedPath, float]
+
+
+# disjoint sets of 0..size-1, with path compression and union by rank
+class UnionFind:
+    def __init__(self, size: int) -> None:
+        self._parent: array = array('l', range(size))
+        self._rank: array = array('b', bytes(size))
+        self.count: int = size  # number of disjoint sets
+
+    def find(self, x: int) -> int:
+        parent: array = self._parent
+        root: int = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    # merge sets of x and y, False if they are already in one set
+    def union(self, x: int, y: int) -> bool:
+        x = self.find(x)
+        y = self.find(y)
+        if x == y:
+            return False
+        if self._rank[x] < self._rank[y]:
+            x, y = y, x
+        self._parent[y] = x
+        if self._rank[x] == self._rank[y]:
+            self._rank[x] += 1
+        self.count -= 1
+        return True
+
+
+# prim's algorithm, spans only the component of start
+def mst_prim(wg: WeightedGraph[V], start: int = 0) -> MSTResult:
+    if start < 0 or start > wg.vertex_count-1:
+        raise IndexError("start should be a vertex index")
+    result: WeightedPath = []
+    # edges are ordered by weight, edges into visited vertices
+    # are not removed from the heap but skipped when popped
+    pq: typing.List[WeightedEdge] = []
+    visited: bytearray = bytearray(wg.vertex_count)
+
+    def visit(index: int) -> None:
+        visited[index] = 1
+        for edge in wg.edges_for_index(index):
+            if not visited[edge.v]:
+                heapq.heappush(pq, edge)
+
+    visit(start)
+    while pq:
+        edge: WeightedEdge = heapq.heappop(pq)
+        if visited[edge.v]:
+            continue
+        result.append(edge)
+        visit(edge.v)
+    return result, total_weight(result)
+
+
+# kruskal's algorithm, spans every component (minimum spanning forest)
+def mst_kruskal(wg: WeightedGraph[V]) -> MSTResult:
+    edges: typing.List[WeightedEdge] = [
+        e for i in range(wg.vertex_count) for e in wg.edges_for_index(i) if e.u < e.v]
+    edges.sort(key=attrgetter('weight'))
+    sets: UnionFind = UnionFind(wg.vertex_count)
+    result: WeightedPath = []
+    for edge in edges:
+        if sets.union(edge.u, edge.v):
+            result.append(edge)
+            if sets.count == 1:
+                break
+    return result, total_weight(result)
+
+
+def print_weighted_path(wg: WeightedGraph, wp: WeightedPath) -> None:
+    for edge in wp:
+        print(f"{wg.vertex_at(edge.u)} {edge.weight}> {wg.vertex_at(edge.v)}")
+    print(f"Total Weight: {total_weight(wp)}")
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from weighted_graph import city_graph
+
+    city_graph2: WeightedGraph[str] = city_graph()
+    prim_path, prim_weight = mst_prim(city_graph2)
+    print_weighted_path(city_graph2, prim_path)
+    _, kruskal_weight = mst_kruskal(city_graph2)
+    print(f"Kruskal total weight: {kruskal_weight}\n")
+
+    def random_graph(n: int, m: int) -> WeightedGraph[int]:
+        # random spanning tree first so the graph is connected
+        wg: WeightedGraph[int] = WeightedGraph(list(range(n)))
+        for v in range(1, n):
+            wg.add_edge_by_indices(random.randrange(v), v,
+                                   random.uniform(1.0, 100.0))
+        for _ in range(m-(n-1)):
+            wg.add_edge_by_indices(random.randrange(n), random.randrange(n),
+                                   random.uniform(1.0, 100.0))
+        return wg
+
+    random.seed(1)
+    for name, n, m in (("sparse", 100_000, 300_000), ("dense", 1_000, 300_000)):
+        graph: WeightedGraph[int] = random_graph(n, m)
+        start: float = time.perf_counter()
+        _, weight1 = mst_prim(graph)
+        prim_time: float = time.perf_counter()-start
+        start = time.perf_counter()
+        _, weight2 = mst_kruskal(graph)
+        kruskal_time: float = time.perf_counter()-start
+        assert abs(weight1-weight2) < 1e-6 * weight1
+        print(f"{name} ({n} vertices, {m} edges): "
+              f"prim {prim_time:.2f}s, kruskal {kruskal_time:.2f}s")
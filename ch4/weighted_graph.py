@@ -1,4 +1,4 @@
-from typing import TypeVar, Generic, List, Tuple
+from typing import TypeVar, Generic, List, Tuple, Optional, Iterable, Dict
 from graph import Graph
 from weighted_edge import WeightedEdge
 
@@ -7,25 +7,42 @@ V = TypeVar('V')  # vertices type in graph
 
 
 class WeightedGraph(Generic[V], Graph[V]):
-    def __init__(self, verices: List[V] = []) -> None:
-        self._vertices: List[V] = verices
-        self._edges: List[List[WeightedEdge]] = [[] for _ in verices]
+    def __init__(self, verices: Optional[List[V]] = None) -> None:
+        super().__init__(verices)
+        self._edges: List[List[WeightedEdge]]
+
+    @property
+    def weighted(self) -> bool:
+        return True
 
     def add_edge_by_indices(self, u: int, v: int, weight: float) -> None:
         edge: WeightedEdge = WeightedEdge(u, v, weight)
         self.add_edge(edge)
 
     def add_edge_by_vertices(self, first: V, second: V, weight: float) -> None:
-        u: int = self._vertices.index(first)
-        v: int = self._vertices.index(second)
+        u: int = self.index_of(first)
+        v: int = self.index_of(second)
         self.add_edge_by_indices(u, v, weight)
 
+    # bulk load of (first, second, weight) triples
+    def add_edges_by_vertices(self, edges: Iterable[Tuple[V, V, float]]) -> None:
+        indices: Dict[V, int] = self._indices
+        try:
+            for first, second, weight in edges:
+                self.add_edge_by_indices(
+                    indices[first], indices[second], weight)
+        except KeyError as e:
+            raise ValueError(f"{e.args[0]!r} is not in graph") from None
+
     def neighbors_for_index_with_weights(self, index: int) -> List[Tuple[V, float]]:
         distance_tuples: List[Tuple[V, float]] = []
         for edge in self.edges_for_index(index):
             distance_tuples.append((self.vertex_at(edge.v), edge.weight))
         return distance_tuples
 
+    def neighbors_for_vertex_with_weights(self, vertex: V) -> List[Tuple[V, float]]:
+        return self.neighbors_for_index_with_weights(self.index_of(vertex))
+
     def __str__(self) -> str:
         desc: str = ''
         for i in range(self.vertex_count):
@@ -33,6 +50,28 @@ class WeightedGraph(Generic[V], Graph[V]):
         return desc
 
 
+# the 15 cities of the demos, with the distances between them in miles
+def city_graph() -> WeightedGraph[str]:
+    graph: WeightedGraph[str] = WeightedGraph([
+        "Seattle", "San Francisco", "Los Angeles", "Riverside", "Phoenix", "Chicago", "Boston", "New York",
+        "Atlanta", "Miami", "Dallas", "Houston", "Detroit", "Philadelphia", "Washington"])
+    graph.add_edges_by_vertices([
+        ("Seattle", "Chicago", 1737), ("Seattle", "San Francisco", 678),
+        ("San Francisco", "Riverside", 386), ("San Francisco", "Los Angeles", 348),
+        ("Los Angeles", "Riverside", 50), ("Los Angeles", "Phoenix", 357),
+        ("Riverside", "Phoenix", 307), ("Riverside", "Chicago", 1704),
+        ("Phoenix", "Dallas", 887), ("Phoenix", "Houston", 1015),
+        ("Dallas", "Chicago", 805), ("Dallas", "Atlanta", 721),
+        ("Dallas", "Houston", 225), ("Houston", "Atlanta", 702),
+        ("Houston", "Miami", 968), ("Atlanta", "Chicago", 588),
+        ("Atlanta", "Washington", 543), ("Atlanta", "Miami", 604),
+        ("Miami", "Washington", 923), ("Chicago", "Detroit", 238),
+        ("Detroit", "Boston", 613), ("Detroit", "Washington", 396),
+        ("Detroit", "New York", 482), ("Boston", "New York", 190),
+        ("New York", "Philadelphia", 81), ("Philadelphia", "Washington", 123)])
+    return graph
+
+
 if __name__ == "__main__":
     city_graph2: WeightedGraph[str] = WeightedGraph(["Seattle", "San Francisco", "Los Angeles", "Riverside", "Phoenix", "Chicago", "Boston", "New York", "Atlanta", "Miami", "Dallas", "Houston",
                                                      "Detroit", "Philadelphia", "Washington"])